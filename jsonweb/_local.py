@@ -3,6 +3,11 @@ try:
 except ImportError:
     from dummy_threading import local
 
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
 
 class LocalStack(local):
     def __init__(self):
@@ -26,3 +31,45 @@ class LocalStack(local):
             return self.stack[-1]
         except IndexError:
             return None
+
+
+class ContextStack(object):
+    """
+    Same interface as :class:`LocalStack` but backed by a
+    :class:`contextvars.ContextVar`, so each asyncio task (as well as each
+    thread) sees its own stack. The stack is stored as linked
+    ``(obj, next)`` pairs, which makes push, pop and top all O(1) and never
+    mutates a stack another context may still be looking at.
+    """
+    def __init__(self, name="jsonweb_stack"):
+        self.__var = ContextVar(name, default=None)
+
+    def push(self, obj):
+        self.__var.set((obj, self.__var.get()))
+
+    def pop(self):
+        node = self.__var.get()
+        if node is None:
+            return None
+        self.__var.set(node[1])
+        return node[0]
+
+    def clear(self):
+        self.__var.set(None)
+
+    @property
+    def top(self):
+        node = self.__var.get()
+        if node is None:
+            return None
+        return node[0]
+
+
+def context_stack(name):
+    """
+    Return a :class:`ContextStack`, or a :class:`LocalStack` on pythons
+    without :mod:`contextvars`.
+    """
+    if ContextVar is None:
+        return LocalStack()
+    return ContextStack(name)
@@ -0,0 +1,180 @@
+"""
+Incremental decoding of JSON read from an :class:`asyncio.StreamReader`.
+Documents are decoded with the same :ref:`object_hook` machinery used by
+:func:`~jsonweb.decode.loader` and handed back one at a time as soon as
+they are complete ::
+
+    >>> from jsonweb.aio import aload_stream
+
+    >>> async def handle_upload(reader, writer):
+    ...     async for person in aload_stream(reader, items=True,
+    ...                                      as_type="Person"):
+    ...         session.add(person)
+
+.. note::
+
+    Requires python 3.6 or greater.
+"""
+
+import asyncio
+import codecs
+import json
+import re
+
+from jsonweb.decode import JsonDecodeError, object_hook, _apply_hook, \
+    _as_type_context
+from jsonweb.validators import EnsureType
+
+#: Number of bytes requested from the reader at a time.
+CHUNK_SIZE = 64 * 1024
+
+#: Number of characters decoded between handing control back to the loop.
+SLICE_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Characters that can continue a number the decoder stopped short of.
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+
+
+class _StreamBuffer(object):
+    """
+    Text buffer filled on demand from a ``StreamReader``.
+    """
+    def __init__(self, reader, chunk_size):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self, size):
+        """
+        Read from the stream until at least ``size`` characters are buffered
+        past ``self.pos`` or the stream is exhausted.
+        """
+        if self.pos:
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        while not self.eof and len(self.text) < size:
+            chunk = await self.reader.read(self.chunk_size)
+            if chunk:
+                self.text += self.decoder.decode(chunk)
+            else:
+                self.text += self.decoder.decode(b"", True)
+                self.eof = True
+
+    async def peek(self):
+        """
+        Skip whitespace and return the next character, or None at EOF.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if self.eof:
+                return None
+            await self.fill(1)
+
+    def advance(self):
+        self.pos += 1
+
+    async def decode(self, decoder):
+        """
+        Decode the next complete JSON value. Returns the value and the number
+        of characters it took up. ``decoder`` must not have an object hook,
+        a value cut short by the buffer is parsed again after every refill.
+        """
+        while True:
+            available = len(self.text) - self.pos
+            try:
+                obj, end = decoder.raw_decode(self.text, self.pos)
+            except ValueError as e:
+                if self.eof:
+                    raise JsonDecodeError(e.args[0])
+                # Most likely a value split across chunks. Doubling what we
+                # buffer before retrying keeps re-parsing linear overall.
+                await self.fill(2 * available)
+                continue
+            # A number followed by nothing but characters that could
+            # continue it ("1." or "1e" for example) may be cut short by
+            # the end of the buffer.
+            if not self.eof and isinstance(obj, (int, float)) \
+                    and _NUMBER_TAIL.match(self.text, end).end() \
+                    == len(self.text):
+                await self.fill(len(self.text) - self.pos + 1)
+                continue
+            size = end - self.pos
+            self.pos = end
+            return obj, size
+
+
+async def aload_stream(reader, items=False, chunk_size=CHUNK_SIZE,
+                       slice_size=SLICE_SIZE, **kw):
+    """
+    Asynchronously iterate over the JSON values read from ``reader``.
+
+    By default ``reader`` is treated as a stream of JSON documents separated
+    by optional whitespace (NDJSON for example) and each document is yielded.
+    Pass ``items=True`` if the stream holds one top level JSON array to yield
+    its elements one at a time instead.
+
+    Parsing hands control back to the event loop every ``slice_size``
+    characters so one large upload cannot starve other tasks. A single value
+    is always decoded in one go.
+
+    :param items: Yield the elements of a top level array.
+    :param chunk_size: Number of bytes to request from ``reader`` at a time.
+    :param slice_size: Number of characters to decode before yielding to
+        the event loop.
+    :param kw: ``handlers``, ``as_type``, ``validate``, ``lazy`` and
+        ``ensure_type`` behave as they do for :func:`~jsonweb.decode.loader`,
+        with ``ensure_type`` checked against each yielded value. The rest
+        are passed to :class:`json.JSONDecoder`.
+    """
+    hook = object_hook(
+        kw.pop("handlers", None),
+        kw.pop("as_type", None),
+        kw.pop("validate", True),
+        kw.pop("lazy", False)
+    )
+    ensure_type = kw.pop("ensure_type", _as_type_context.top)
+    # The hook runs once over each complete value, not on every attempt.
+    decoder = json.JSONDecoder(**kw)
+    buf = _StreamBuffer(reader, chunk_size)
+
+    in_array = False
+    first = True
+    decoded = 0
+
+    while True:
+        char = await buf.peek()
+        if items:
+            if not in_array:
+                if char != "[":
+                    raise JsonDecodeError("Expecting '[' at start of stream.")
+                buf.advance()
+                in_array = True
+                continue
+            if char == "]":
+                return
+            if not first:
+                if char != ",":
+                    raise JsonDecodeError("Expecting ',' or ']' in array.")
+                buf.advance()
+                await buf.peek()
+            first = False
+        elif char is None:
+            return
+
+        obj, size = await buf.decode(decoder)
+        obj = _apply_hook(obj, hook)
+        if ensure_type:
+            obj = EnsureType(ensure_type).validate(obj)
+        yield obj
+
+        decoded += size
+        if decoded >= slice_size:
+            decoded = 0
+            await asyncio.sleep(0)
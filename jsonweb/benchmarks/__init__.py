@@ -0,0 +1,320 @@
+"""
+Performance baselines for the encode, decode and validate hot paths. Run
+every benchmark and save the results ::
+
+    $ python -m jsonweb.benchmarks run -o baseline.json
+
+Then after making changes ::
+
+    $ python -m jsonweb.benchmarks run -o current.json
+    $ python -m jsonweb.benchmarks compare baseline.json current.json
+
+``compare`` exits with status 1 if any benchmark got slower by more than
+``--threshold`` (10% by default).
+
+Each benchmark is a function decorated with :func:`benchmark`. It receives
+a payload shape name (see :data:`~jsonweb.benchmarks.payloads.SHAPES`) and
+returns a zero argument callable. By default the callable is timed. For
+``metric="bytes"`` benchmarks the memory still allocated (according to
+:mod:`tracemalloc`) by the object it returns is recorded instead. Those
+are skipped on pythons without :mod:`tracemalloc`.
+"""
+
+import json
+import platform
+import re
+import time
+import timeit
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from jsonweb.decode import loader, _default_object_handlers
+from jsonweb.encode import JsonWebEncoder, dumper
+from jsonweb.validators import List, Dict, DateTime, EnsureType, Integer, \
+    Number, Regex, ValidationError
+from jsonweb.benchmarks import payloads
+
+_benchmarks = OrderedDict()
+
+
+def benchmark(name, shapes=None, metric="seconds"):
+    """
+    Register a benchmark setup function under ``name``. It is run once for
+    every shape in ``shapes`` (all of them by default). ``metric`` is either
+    ``"seconds"`` or ``"bytes"``.
+    """
+    def wrapper(func):
+        _benchmarks[name] = (func, shapes or sorted(payloads.SHAPES), metric)
+        return func
+    return wrapper
+
+
+@benchmark("encode.dumper")
+def bench_dumper(shape):
+    cls, schema = payloads.register_types(shape)
+    objs = [cls(**obj) for obj in payloads.make_payload(shape)]
+    return lambda: dumper(objs)
+
+
+@benchmark("decode.json_loads")
+def bench_json_loads(shape):
+    # Plain json.loads over the same document, as a point of reference.
+    json_str = json.dumps(payloads.make_payload(shape, typed=True))
+    return lambda: json.loads(json_str)
+
+
+@benchmark("decode.loader")
+def bench_loader(shape):
+    payloads.register_types(shape)
+    json_str = json.dumps(payloads.make_payload(shape, typed=True))
+    return lambda: loader(json_str)
+
+
+@benchmark("decode.loader_no_validate")
+def bench_loader_no_validate(shape):
+    payloads.register_types(shape)
+    json_str = json.dumps(payloads.make_payload(shape, typed=True))
+    return lambda: loader(json_str, validate=False)
+
+
+# ``as_type`` applies to nested objects too, so only the flat shapes.
+@benchmark("decode.loader_as_type", shapes=("small", "wide"))
+def bench_loader_as_type(shape):
+    payloads.register_types(shape)
+    json_str = json.dumps(payloads.make_payload(shape))
+    type_name = payloads.type_name_for(shape)
+    return lambda: loader(json_str, as_type=type_name)
+
+
+@benchmark("decode.loader_batch", shapes=("small", "wide"))
+def bench_loader_batch(shape):
+    payloads.register_types(shape)
+    json_str = json.dumps(payloads.make_payload(shape))
+    type_name = payloads.type_name_for(shape)
+    return lambda: loader(json_str, as_type=type_name, batch=True)
+
+
+@benchmark("decode.from_object_construct")
+def bench_construct(shape):
+    payloads.register_types(shape)
+    factory, cls, schema = _default_object_handlers[
+        payloads.type_name_for(shape)
+    ]
+    objs = payloads.make_payload(shape)
+    return lambda: [factory(cls, obj) for obj in objs]
+
+
+@benchmark("decode.from_object_construct_trusted")
+def bench_construct_trusted(shape):
+    payloads.register_types(shape)
+    factory, cls, schema = _default_object_handlers[
+        payloads.type_name_for(shape)
+    ]
+    factory = factory.trusted()
+    objs = payloads.make_payload(shape)
+    return lambda: [factory(cls, obj) for obj in objs]
+
+
+@benchmark("schema.validate")
+def bench_schema_validate(shape):
+    cls, schema = payloads.register_types(shape)
+    validator = schema()
+    objs = payloads.make_payload(shape)
+    return lambda: [validator.validate(obj) for obj in objs]
+
+
+@benchmark("schema.validate_invalid")
+def bench_schema_validate_invalid(shape):
+    # Every field of every object has the wrong type.
+    cls, schema = payloads.register_types(shape)
+    validator = List(schema())
+    objs = [dict((key, [value]) for key, value in obj.items())
+            for obj in payloads.make_payload(shape)]
+
+    def validate():
+        try:
+            validator.validate(objs)
+        except ValidationError as e:
+            return e
+    return validate
+
+
+@benchmark("validators.List")
+def bench_list(shape):
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(Integer)
+    items = list(range(size * width))
+    return lambda: validator.validate(items)
+
+
+@benchmark("validators.List_of_small_lists")
+def bench_list_of_lists(shape):
+    # Mostly per call overhead: three items per inner list.
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(List(Integer))
+    items = [[i, i + 1, i + 2] for i in range(size * width)]
+    return lambda: validator.validate(items)
+
+
+@benchmark("validators.Dict_of_small_dicts")
+def bench_dict_of_dicts(shape):
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(Dict(Integer))
+    items = [{"a": i, "b": i} for i in range(size * width)]
+    return lambda: validator.validate(items)
+
+
+@benchmark("validators.List_EnsureType_name")
+def bench_list_ensure_type(shape):
+    cls, schema = payloads.register_types(shape)
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(EnsureType(payloads.type_name_for(shape)))
+    objs = [cls(**obj) for obj in payloads.make_payload(shape)] * width
+    return lambda: validator.validate(objs)
+
+
+@benchmark("validators.DateTime")
+def bench_datetime(shape):
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(DateTime(JsonWebEncoder._DT_FORMAT))
+    items = [dumper(datetime(2012, 1, 1) + timedelta(seconds=i))[1:-1]
+             for i in range(size * width)]
+    return lambda: validator.validate(items)
+
+
+@benchmark("validators.Dict")
+def bench_dict(shape):
+    size, width, depth = payloads.SHAPES[shape]
+    validator = Dict(Number)
+    obj = dict(("key_{0}".format(i), i) for i in range(size * width))
+    return lambda: validator.validate(obj)
+
+
+@benchmark("validators.Dict_Regex_keys")
+def bench_dict_regex_keys(shape):
+    # The same few keys in every dict.
+    size, width, depth = payloads.SHAPES[shape]
+    validator = List(Dict(Number, key_validator=Regex(r"^[a-z]{2}_[A-Z]{2}$")))
+    locales = ["en_US", "en_GB", "fr_FR", "de_DE", "es_ES"]
+    items = [dict((locale, i) for locale in locales) for i in range(size)]
+    return lambda: validator.validate(items)
+
+
+@benchmark("memory.json_loads", metric="bytes")
+def bench_memory_dicts(shape):
+    json_str = json.dumps(payloads.make_payload(shape))
+    return lambda: json.loads(json_str)
+
+
+@benchmark("memory.loader", metric="bytes")
+def bench_memory_objects(shape):
+    payloads.register_types(shape)
+    json_str = json.dumps(payloads.make_payload(shape))
+    type_name = payloads.type_name_for(shape)
+    return lambda: loader(json_str, as_type=type_name, validate=False)
+
+
+@benchmark("memory.loader_records", metric="bytes")
+def bench_memory_records(shape):
+    cls, schema = payloads.register_types(shape)
+    type_name = "Record_{0}".format(shape)
+    schema.record_class(type_name)
+    json_str = json.dumps(payloads.make_payload(shape))
+    return lambda: loader(json_str, as_type=type_name, validate=False)
+
+
+def time_callable(func, repeat=5, min_time=0.2):
+    """
+    Return the best time, in seconds, of a single call to ``func``. ``func``
+    is called in loops long enough to take at least ``min_time`` seconds,
+    ``repeat`` times over.
+    """
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        if timer.timeit(number) >= min_time:
+            break
+        number *= 10
+    return min(timer.repeat(repeat, number)) / number, number
+
+
+def measure_memory(func):
+    """
+    Return the number of bytes allocated by ``func`` that are still held by
+    the object it returns.
+    """
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        obj = func()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del obj
+    return size
+
+
+def run(pattern=None, repeat=5, min_time=0.2, report=None):
+    """
+    Run every benchmark whose ``name.shape`` matches the regex ``pattern``.
+    Returns a dict suitable for :func:`save` and :func:`compare`.
+    ``report`` is called with each name and result as it completes.
+    """
+    results = OrderedDict()
+    for name, (setup, shapes, metric) in _benchmarks.items():
+        for shape in shapes:
+            key = "{0}.{1}".format(name, shape)
+            if pattern and not re.search(pattern, key):
+                continue
+            if metric == "bytes":
+                try:
+                    import tracemalloc  # noqa, only checking it exists.
+                except ImportError:
+                    continue
+                results[key] = {"bytes": measure_memory(setup(shape))}
+            else:
+                seconds, number = time_callable(setup(shape), repeat,
+                                                min_time)
+                results[key] = {"seconds": seconds, "number": number,
+                                "repeat": repeat}
+            if report:
+                report(key, results[key])
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def save(results, path):
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare two sets of results. Returns a list of
+    ``(name, metric, baseline, current, ratio, regressed)`` tuples, one per
+    benchmark found in both, where ``regressed`` is True if ``current`` is
+    more than ``threshold`` slower (or bigger).
+    """
+    rows = []
+    base = baseline["results"]
+    for name, result in current["results"].items():
+        if name not in base:
+            continue
+        metric = "seconds" in result and "seconds" or "bytes"
+        before = base[name][metric]
+        after = result[metric]
+        ratio = float(after) / before if before else 1.0
+        rows.append((name, metric, before, after, ratio,
+                     ratio > 1 + threshold))
+    return rows
@@ -0,0 +1,71 @@
+import argparse
+import sys
+
+from jsonweb import benchmarks
+
+
+def _format(metric, value):
+    if metric == "bytes":
+        for unit, scale in (("MB", 1e-6), ("KB", 1e-3)):
+            if value * scale >= 1:
+                return "{0:.1f}{1}".format(value * scale, unit)
+        return "{0}B".format(value)
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if value * scale >= 1:
+            return "{0:.2f}{1}".format(value * scale, unit)
+    return "{0:.0f}ns".format(value * 1e9)
+
+
+def run(args):
+    def report(name, result):
+        metric = "seconds" in result and "seconds" or "bytes"
+        print("{0:<45} {1:>10}".format(name, _format(metric, result[metric])))
+
+    results = benchmarks.run(args.filter, args.repeat, args.min_time, report)
+    if args.output:
+        benchmarks.save(results, args.output)
+    return 0
+
+
+def compare(args):
+    rows = benchmarks.compare(benchmarks.load(args.baseline),
+                              benchmarks.load(args.current), args.threshold)
+    regressions = 0
+    for name, metric, before, after, ratio, regressed in rows:
+        regressions += regressed
+        print("{0:<45} {1:>10} {2:>10} {3:>7.2f}x{4}".format(
+            name, _format(metric, before), _format(metric, after), ratio,
+            regressed and "  REGRESSION" or ""
+        ))
+    return regressions and 1 or 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m jsonweb.benchmarks")
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("-o", "--output", help="write results to a file")
+    run_parser.add_argument("-k", "--filter",
+                            help="only run benchmarks matching this regex")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--min-time", type=float, default=0.2,
+                            help="minimum seconds per timing loop")
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser(
+        "compare", help="flag regressions against a saved baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="allowed slowdown (default 0.1 = 10%%)")
+    compare_parser.set_defaults(func=compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
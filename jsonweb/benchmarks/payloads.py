@@ -0,0 +1,93 @@
+"""
+Synthetic payloads for the benchmarks. Every payload is a list of ``size``
+objects with ``width`` scalar fields each, nested ``depth`` levels deep
+through a ``child`` field. Only the top level objects carry a ``__type__``;
+children are validated by the nested schema.
+"""
+
+from jsonweb.decode import JsonWebObjectHandler, from_object
+from jsonweb.encode import to_object
+from jsonweb.schema import ObjectSchema
+from jsonweb.validators import Integer, String, Float, Boolean
+
+#: name -> (size, width, depth)
+SHAPES = {
+    "small": (10, 5, 1),
+    "wide": (100, 50, 1),
+    "deep": (100, 5, 5),
+    "large": (5000, 10, 2),
+}
+
+_VALIDATORS = (String, Integer, Float, Boolean)
+
+
+def _value(kind, i):
+    if kind is String:
+        return "value-{0}".format(i)
+    if kind is Integer:
+        return i
+    if kind is Float:
+        return i + 0.5
+    return bool(i % 2)
+
+
+def field_names(width):
+    return ["field_{0}".format(i) for i in range(width)]
+
+
+def make_dict(width, depth, i=0, type_name=None):
+    obj = dict(
+        (name, _value(_VALIDATORS[n % len(_VALIDATORS)], i))
+        for n, name in enumerate(field_names(width))
+    )
+    if depth > 1:
+        obj["child"] = make_dict(width, depth - 1, i)
+    if type_name:
+        obj["__type__"] = type_name
+    return obj
+
+
+def make_payload(shape, typed=False):
+    """
+    Return a list of plain dicts for ``shape``. With ``typed`` each dict
+    carries the ``__type__`` registered by :func:`register_types`.
+    """
+    size, width, depth = SHAPES[shape]
+    type_name = typed and type_name_for(shape) or None
+    return [make_dict(width, depth, i, type_name) for i in range(size)]
+
+
+def type_name_for(shape):
+    return "Bench_{0}".format(shape)
+
+
+def make_schema(width, depth):
+    fields = dict(
+        (name, _VALIDATORS[n % len(_VALIDATORS)]())
+        for n, name in enumerate(field_names(width))
+    )
+    if depth > 1:
+        fields["child"] = make_schema(width, depth - 1)()
+    return ObjectSchema.create("BenchSchema{0}".format(depth), fields)
+
+
+def register_types(shape):
+    """
+    Create and register (with :func:`~jsonweb.decode.from_object` and
+    :func:`~jsonweb.encode.to_object`) a class for ``shape``. Returns the
+    class and its schema.
+    """
+    size, width, depth = SHAPES[shape]
+    type_name = type_name_for(shape)
+
+    class BenchObject(object):
+        def __init__(self, **fields):
+            self.__dict__.update(fields)
+
+    kw_args = [(name, None) for name in field_names(width) + ["child"]]
+    schema = make_schema(width, depth)
+    from_object(JsonWebObjectHandler([], kw_args), type_name, schema)(
+        BenchObject
+    )
+    to_object(cls_type=type_name)(BenchObject)
+    return BenchObject, schema
@@ -46,19 +46,27 @@ But how was :mod:`jsonweb` able to determine how to instantiate the
 detailed explanation.
 """
 
+import codecs
 import inspect
 import json
+import mmap
+import multiprocessing
+import os
+import re
+import threading
+import time
 from contextlib import contextmanager
-from jsonweb.py3k import items
+from jsonweb.py3k import PY3k, basestring, items, keys
 
-from jsonweb.validators import EnsureType
+from jsonweb.validators import EnsureType, _limit_errors
 from jsonweb.exceptions import JsonWebError
-from jsonweb._local import LocalStack
+from jsonweb._local import context_stack
 
 _DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
-# Thread local object stack used by :func:`ensure_type`
-_as_type_context = LocalStack()
+# Context local (per thread and per asyncio task) object stack used by
+# :func:`ensure_type`
+_as_type_context = context_stack("jsonweb_as_type")
 
 
 class JsonDecodeError(JsonWebError):
@@ -69,6 +77,17 @@ class JsonDecodeError(JsonWebError):
         JsonWebError.__init__(self, message, **extras)
 
 
+class DecodeLimitError(JsonDecodeError):
+    """
+    Raised when a document crosses one of the resource limits passed to
+    :func:`loader` or :func:`object_hook`. ``extras`` holds the name of the
+    ``limit`` and its ``value``.
+    """
+    def __init__(self, message, limit, value, **extras):
+        JsonDecodeError.__init__(self, message, limit=limit, value=value,
+                                 **extras)
+
+
 class ObjectDecodeError(JsonWebError):
     """
     Raised when python containers (dicts and lists) cannot be decoded into
@@ -98,6 +117,16 @@ class ObjectNotFoundError(ObjectDecodeError):
         )
 
 
+class ObjectReferenceError(ObjectDecodeError):
+    """
+    Raised when :func:`loader` is resolving references (see ``id_key``) and
+    a reference points to an id that is not in the document, or objects
+    refer back to themselves while being constructed.
+    """
+    def __init__(self, message, ref):
+        ObjectDecodeError.__init__(self, message, ref=ref)
+
+
 class JsonWebObjectHandler(object):
     def __init__(self, args, kw_args=None):
         self.args = args
@@ -116,40 +145,175 @@ class JsonWebObjectHandler(object):
         
         return cls(*cls_args, **cls_kw_args)
 
+    def trusted(self):
+        """
+        Return a :class:`TrustedObjectHandler` built from the same
+        arguments. It is created once and cached.
+        """
+        try:
+            return self.__trusted
+        except AttributeError:
+            self.__trusted = TrustedObjectHandler(self.args, self.kw_args)
+            return self.__trusted
+
+
+class TrustedObjectHandler(JsonWebObjectHandler):
+    """
+    Builds instances without calling ``__init__``. The instance is created
+    with ``cls.__new__`` and every ``__init__`` argument is set directly as
+    an attribute of the same name.
+
+    The first instance of each class is built with ``__init__`` as usual,
+    and its attributes are checked. ``__init__`` is skipped for later
+    instances only if all it did was store each argument under its own
+    name. Otherwise (``self._name = name.upper()`` for example) every
+    instance keeps going through ``__init__``. That first instance is all
+    the check sees, so only use this on data you trust. See
+    ``trusted_construct`` on :func:`from_object` and ``trusted`` on
+    :func:`loader`.
+    """
+    def __init__(self, args, kw_args=None):
+        JsonWebObjectHandler.__init__(self, args, kw_args or ())
+        self.names = frozenset(list(args) + [k for k, d in self.kw_args])
+        self.plans = {}
+
+    def __call__(self, cls, obj):
+        try:
+            new, has_dict = self.plans[cls]
+        except KeyError:
+            return self.__plan(cls, obj)
+        if new is None:
+            return JsonWebObjectHandler.__call__(self, cls, obj)
+
+        instance = new(cls)
+        if has_dict:
+            # obj usually holds exactly the attributes we need (plus
+            # __type__ if no schema has run), so copy it in one go.
+            values = obj.copy()
+            values.pop("__type__", None)
+            if keys(values) != self.names:
+                values = self.__values(obj)
+            instance.__dict__ = values
+        else:
+            for key, value in items(self.__values(obj)):
+                setattr(instance, key, value)
+        return instance
+
+    def __values(self, obj):
+        values = {}
+        for arg in self.args:
+            values[arg] = obj[arg]
+        for key, default in self.kw_args:
+            values[key] = obj.get(key, default)
+        return values
+
+    def __plan(self, cls, obj):
+        """
+        Build the first instance of ``cls`` with ``__init__`` and work out
+        how to build the rest (see the class docstring).
+        """
+        values = self.__values(obj)
+        instance = JsonWebObjectHandler.__call__(self, cls, values)
+
+        has_dict = _has_instance_dict(cls)
+        if has_dict:
+            stored = vars(instance)
+            simple = len(stored) == len(values)
+        else:
+            # Any slot besides the arguments must be left empty.
+            simple = not any(hasattr(instance, name)
+                             for name in _slot_names(cls) - self.names)
+        missing = object()
+        simple = simple and all(getattr(instance, key, missing) is value
+                                for key, value in items(values))
+
+        self.plans[cls] = cls.__new__ if simple else None, has_dict
+        return instance
+
+    def trusted(self):
+        return self
+
+
+def _has_instance_dict(cls):
+    """
+    Return True if instances of ``cls`` have a ``__dict__``.
+    """
+    # Instances get a __dict__ from the first class in the MRO without
+    # __slots__ (or with "__dict__" in them), which leaves a "__dict__"
+    # descriptor in that class's namespace.
+    return any("__dict__" in vars(klass) for klass in cls.__mro__)
+
+
+def _slot_names(cls):
+    """
+    Return the names of the ``__slots__`` of ``cls`` and its bases, leaving
+    out ``__dict__`` and ``__weakref__``.
+    """
+    names = set()
+    for klass in cls.__mro__:
+        slots = vars(klass).get("__slots__", ())
+        if isinstance(slots, basestring):
+            slots = (slots,)
+        names.update(slots)
+    return names - set(["__dict__", "__weakref__"])
+
 
 class _ObjectHandlers(object):
-    def __init__(self):
+    def __init__(self, parent=None):
         self.__handlers = {}
         self.__deferred_updates = {}
-        
+        self.__parent = parent
+        self.__generation = 0
+
+    @property
+    def generation(self):
+        """
+        A number that changes whenever a handler is added, replaced or
+        removed (here or in a parent registry). Anything caching lookups
+        can compare it to know when to look again.
+        """
+        if self.__parent is not None:
+            return self.__generation + self.__parent.generation
+        return self.__generation
+
     def add_handler(self, cls, handler, type_name=None, schema=None):
         name = type_name or cls.__name__
         self.__handlers[name] = self.__merge_tuples(
             self.__deferred_updates.get(name, (None,)*3),            
             (handler, cls, schema)
         )
+        self.__generation += 1
         
     def get(self, name):
         """
         Get a handler tuple. Return None if no such handler.
         """
-        return self.__handlers.get(name)
+        handler_tuple = self.__handlers.get(name)
+        if handler_tuple is None and self.__parent is not None:
+            return self.__parent.get(name)
+        return handler_tuple
     
     def set(self, name, handler_tuple):
         """
         Add a handler tuple (handler, cls, schema)
         """
         self.__handlers[name] = handler_tuple
+        self.__generation += 1
     
     def clear(self):
+        """
+        Remove all handlers. Handlers of a parent registry (see
+        :meth:`overlay`) are left alone.
+        """
         self.__handlers = {}
         self.__deferred_updates = {}
+        self.__generation += 1
         
     def update_handler(self, name, cls=None, handler=None, schema=None):
         """
         Modify cls, handler and schema for a decorated class. 
         """
-        handler_tuple = self.__handlers[name]
+        handler_tuple = self[name]
         self.set(name, self.__merge_tuples((handler, cls, schema), 
                                            handler_tuple))
                  
@@ -161,7 +325,7 @@ class _ObjectHandlers(object):
         values will be updated accordingly. Items in __deferred_updates will
         take precedence over those passed into add_handler.
         """
-        if name in self.__handlers:
+        if name in self:
             self.update_handler(name, cls, handler, schema)
             return
         d = self.__deferred_updates.get(name, (None,)*3)
@@ -172,6 +336,15 @@ class _ObjectHandlers(object):
         handler_copy = _ObjectHandlers()
         [handler_copy.set(n, t) for n, t in self]
         return handler_copy
+
+    def overlay(self):
+        """
+        Return an empty registry layered on top of this one. Lookups fall
+        through to this registry while anything added or updated lands in
+        the overlay only, so creating one and applying a few overrides costs
+        O(overrides) rather than the O(handlers) of :meth:`copy`.
+        """
+        return _ObjectHandlers(parent=self)
     
     def __merge_tuples(self, a_tuple, b_tuple):
         """
@@ -182,16 +355,99 @@ class _ObjectHandlers(object):
         return tuple([(a or b) for a, b in zip(a_tuple, b_tuple)])
     
     def __contains__(self, handler_name):
-        return handler_name in self.__handlers
+        return self.get(handler_name) is not None
     
     def __getitem__(self, handler):
-        return self.__handlers[handler]
+        handler_tuple = self.__handlers.get(handler)
+        if handler_tuple is None:
+            if self.__parent is None:
+                raise KeyError(handler)
+            return self.__parent[handler]
+        return handler_tuple
     
     def __iter__(self):
+        if self.__parent is not None:
+            for name, handler_tuple in self.__parent:
+                if name not in self.__handlers:
+                    yield name, handler_tuple
         for name, handler_tuple in items(self.__handlers):
             yield name, handler_tuple
 
 
+_timer = getattr(time, "perf_counter", time.time)
+
+
+class DecodeStats(object):
+    """
+    Collects per ``__type__`` counts and timings from :class:`ObjectHook`.
+    Pass an instance to :func:`loader` or :func:`object_hook` with the
+    ``stats`` kw arg, or enable the module level :data:`decode_stats`
+    collector to instrument every decode ::
+
+        >>> from jsonweb.decode import decode_stats
+        >>> decode_stats.enable()
+        >>> people = loader(json_str)
+        >>> decode_stats.snapshot()
+        {'Person': {'count': 2, 'validate_time': 3.1e-05,
+                    'construct_time': 4e-06, 'failures': {}}}
+
+    ``validate_time`` and ``construct_time`` are cumulative seconds spent in
+    the schema and the handler of successfully decoded objects. ``failures``
+    counts exceptions raised while validating or constructing by exception
+    class name.
+    """
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.__lock = threading.Lock()
+        self.__types = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def record(self, obj_type, validate_time, construct_time):
+        with self.__lock:
+            entry = self.__entry(obj_type)
+            entry["count"] += 1
+            entry["validate_time"] += validate_time
+            entry["construct_time"] += construct_time
+
+    def record_failure(self, obj_type, exc):
+        name = exc.__class__.__name__
+        with self.__lock:
+            failures = self.__entry(obj_type)["failures"]
+            failures[name] = failures.get(name, 0) + 1
+
+    def snapshot(self):
+        """
+        Return a copy of the stats collected so far, keyed by ``__type__``.
+        """
+        with self.__lock:
+            return dict(
+                (obj_type, dict(entry, failures=dict(entry["failures"])))
+                for obj_type, entry in items(self.__types)
+            )
+
+    def reset(self):
+        with self.__lock:
+            self.__types = {}
+
+    def __entry(self, obj_type):
+        entry = self.__types.get(obj_type)
+        if entry is None:
+            entry = self.__types[obj_type] = {
+                "count": 0, "validate_time": 0.0,
+                "construct_time": 0.0, "failures": {}
+            }
+        return entry
+
+#: Module level :class:`DecodeStats`, disabled until :meth:`~DecodeStats.enable`
+#: is called. Used by every :class:`ObjectHook` not given its own ``stats``.
+decode_stats = DecodeStats(enabled=False)
+
+
 class ObjectHook(object):
     """
     This class does most of the work in managing the handlers that decode the
@@ -199,9 +455,21 @@ class ObjectHook(object):
     directly. :func:`object_hook` is responsible for instantiating and using it.
     """
 
-    def __init__(self, handlers, validate=True):
+    def __init__(self, handlers, validate=True, lazy=False, max_objects=None,
+                 stats=None, trusted=False, max_keys=None):
         self.handlers = handlers
         self.validate = validate
+        self.lazy = lazy
+        self.trusted = trusted
+        self.max_objects = max_objects
+        self.max_keys = max_keys
+        self.objects = 0
+        if stats is None and decode_stats.enabled:
+            stats = decode_stats
+        self.stats = stats
+        if stats is not None:
+            # Only instrumented hooks pay for timing.
+            self.construct = self.timed_construct
             
     def decode_obj(self, obj):
         """        
@@ -212,22 +480,196 @@ class ObjectHook(object):
         be called with ``obj`` as it only argument. If an :class:`ObjectSchema`
         was supplied for the class, ``obj`` will first be validated then passed
         to handler. The handler should return a new python instant of type ``__type__``.
+
+        If ``self.lazy`` is True a :class:`LazyObject` is returned instead and
+        validation and construction are put off until it is first used.
         """
         if "__type__" not in obj:
             return obj
         
         obj_type = obj["__type__"]
         try:
-            factory, cls, schema = self.handlers[obj_type]
+            handler_tuple = self.handlers[obj_type]
         except KeyError:
             raise ObjectNotFoundError(obj_type)
-                
+
+        if self.max_objects is not None:
+            self.objects += 1
+            if self.objects > self.max_objects:
+                raise DecodeLimitError(
+                    "Document contains more than {0} typed objects.".format(
+                        self.max_objects),
+                    "max_objects", self.max_objects
+                )
+
+        if self.lazy:
+            return LazyObject(self, handler_tuple, obj)
+        return self.construct(obj_type, handler_tuple, obj)
+
+    def construct(self, obj_type, handler_tuple, obj):
+        """
+        Validate ``obj`` against the schema in ``handler_tuple`` (if any) and
+        build the class instance from it.
+        """
+        factory, cls, schema = handler_tuple
+        if self.trusted and isinstance(factory, JsonWebObjectHandler):
+            factory = factory.trusted()
         if schema and self.validate:
             obj = schema().validate(obj)
         try:
             return factory(cls, obj)
         except KeyError as e:
             raise ObjectAttributeError(obj_type, e.args[0])
+
+    def decode_many(self, objs, obj_type):
+        """
+        Decode a list of dicts that are all of type ``obj_type``. The result
+        is the same as running :meth:`decode_obj` on each of them with
+        ``obj_type`` as the ``as_type`` (dicts with a different ``__type__``
+        still decode to their own type, anything else is passed through),
+        but the handler and schema are looked up once and the objects are
+        then validated and built in one tight loop.
+        """
+        try:
+            handler_tuple = self.handlers[obj_type]
+        except KeyError:
+            raise ObjectNotFoundError(obj_type)
+
+        max_keys = self.max_keys
+        if self.lazy or self.stats is not None \
+                or self.max_objects is not None:
+            decoded = []
+            for obj in objs:
+                if isinstance(obj, dict):
+                    if max_keys is not None and len(obj) > max_keys:
+                        raise _too_many_keys(max_keys)
+                    obj.setdefault("__type__", obj_type)
+                    obj = self.decode_obj(obj)
+                decoded.append(obj)
+            return decoded
+
+        factory, cls, schema = handler_tuple
+        if self.trusted and isinstance(factory, JsonWebObjectHandler):
+            factory = factory.trusted()
+        validate = None
+        if schema and self.validate:
+            validate = schema().validate
+
+        decoded = []
+        append = decoded.append
+        for obj in objs:
+            if not isinstance(obj, dict):
+                append(obj)
+                continue
+            if max_keys is not None and len(obj) > max_keys:
+                raise _too_many_keys(max_keys)
+            if obj.setdefault("__type__", obj_type) != obj_type:
+                append(self.decode_obj(obj))
+                continue
+            if validate is not None:
+                obj = validate(obj)
+            try:
+                append(factory(cls, obj))
+            except KeyError as e:
+                raise ObjectAttributeError(obj_type, e.args[0])
+        return decoded
+
+    def timed_construct(self, obj_type, handler_tuple, obj):
+        """
+        :meth:`construct` that records timings and failures to
+        ``self.stats``.
+        """
+        factory, cls, schema = handler_tuple
+        if self.trusted and isinstance(factory, JsonWebObjectHandler):
+            factory = factory.trusted()
+        start = validated = _timer()
+        try:
+            if schema and self.validate:
+                obj = schema().validate(obj)
+                validated = _timer()
+            try:
+                instance = factory(cls, obj)
+            except KeyError as e:
+                raise ObjectAttributeError(obj_type, e.args[0])
+        except Exception as e:
+            self.stats.record_failure(obj_type, e)
+            raise
+        self.stats.record(obj_type, validated - start, _timer() - validated)
+        return instance
+
+
+def _forward(name):
+    def method(self, *args):
+        return getattr(resolve(self), name)(*args)
+    method.__name__ = name
+    return method
+
+
+class LazyObject(object):
+    """
+    Stand-in returned by :class:`ObjectHook` (and so :func:`loader`) when
+    decoding with ``lazy=True``. It holds on to the decoded dict and only
+    runs the schema and handler for its ``__type__`` the first time one of
+    its attributes is used. Any :class:`~jsonweb.validators.ValidationError`
+    or :class:`ObjectDecodeError` is raised at that point.
+
+    ``isinstance`` checks (and so :class:`~jsonweb.validators.EnsureType`)
+    see the decorated class without constructing the instance. Use
+    :func:`resolve` to get the real instance.
+    """
+    __slots__ = ("_lazy_hook", "_lazy_handler", "_lazy_obj", "_lazy_instance")
+
+    def __init__(self, hook, handler_tuple, obj):
+        object.__setattr__(self, "_lazy_hook", hook)
+        object.__setattr__(self, "_lazy_handler", handler_tuple)
+        object.__setattr__(self, "_lazy_obj", obj)
+
+    @property
+    def __class__(self):
+        return object.__getattribute__(self, "_lazy_handler")[1]
+
+    def __getattr__(self, name):
+        return getattr(resolve(self), name)
+
+    def __setattr__(self, name, value):
+        setattr(resolve(self), name, value)
+
+    def __delattr__(self, name):
+        delattr(resolve(self), name)
+
+    def __bool__(self):
+        return bool(resolve(self))
+    __nonzero__ = __bool__
+
+# Special methods are looked up on the type, not through ``__getattr__``.
+for _name in ("__repr__", "__str__", "__dir__", "__hash__", "__eq__", "__ne__",
+              "__lt__", "__le__", "__gt__", "__ge__", "__len__", "__iter__",
+              "__contains__", "__getitem__", "__setitem__", "__delitem__",
+              "__call__"):
+    setattr(LazyObject, _name, _forward(_name))
+del _name
+
+
+def resolve(obj):
+    """
+    Return the real instance behind a :class:`LazyObject`, validating and
+    constructing it if that has not happened yet. Anything else is returned
+    as is.
+    """
+    if type(obj) is not LazyObject:
+        return obj
+    try:
+        return object.__getattribute__(obj, "_lazy_instance")
+    except AttributeError:
+        pass
+    hook = object.__getattribute__(obj, "_lazy_hook")
+    raw = object.__getattribute__(obj, "_lazy_obj")
+    instance = hook.construct(
+        raw["__type__"], object.__getattribute__(obj, "_lazy_handler"), raw
+    )
+    object.__setattr__(obj, "_lazy_instance", instance)
+    object.__setattr__(obj, "_lazy_obj", None)
+    return instance
         
 
 def get_arg_spec(func):
@@ -251,19 +693,22 @@ def get_arg_spec(func):
     return args, kw_args
 
 
-def get_jsonweb_handler(cls):
+def get_jsonweb_handler(cls, trusted=False):
     arg_spec = get_arg_spec(cls.__init__)
     if arg_spec is None:
         raise JsonWebError("Unable to generate an object_hook handler from "
                            "{0}'s `__init__` method.".format(cls.__name__))
     args, kw = get_arg_spec(cls.__init__)
 
+    if trusted:
+        return TrustedObjectHandler(args, kw or None)
     return JsonWebObjectHandler(args, kw or None)
 
 _default_object_handlers = _ObjectHandlers()
 
 
-def from_object(handler=None, type_name=None, schema=None):
+def from_object(handler=None, type_name=None, schema=None,
+                trusted_construct=False):
     """
     Decorating a class with :func:`from_object` will allow :func:`json.loads`
     to return instances of that class.
@@ -390,16 +835,27 @@ def from_object(handler=None, type_name=None, schema=None):
     Schemas are useful for validating user supplied json in web services or
     other web applications. For a detailed explanation on using schemas see
     the :mod:`jsonweb.schema`.
+
+    If your class's ``__init__`` only copies its arguments onto ``self``
+    you can set ``trusted_construct`` to True. Instances will then be built
+    by a :class:`TrustedObjectHandler`, which skips ``__init__`` and sets the
+    attributes directly. It cannot be combined with ``handler``. To do this
+    for a single :func:`loader` call use its ``trusted`` kw argument instead.
     """
+    if handler and trusted_construct:
+        raise JsonWebError("Cannot use trusted_construct with a handler.")
+
     def wrapper(cls):
         _default_object_handlers.add_handler(
-            cls, handler or get_jsonweb_handler(cls), type_name, schema
+            cls, handler or get_jsonweb_handler(cls, trusted_construct),
+            type_name, schema
         )
         return cls
     return wrapper
 
 
-def object_hook(handlers=None, as_type=None, validate=True):
+def object_hook(handlers=None, as_type=None, validate=True, lazy=False,
+                max_keys=None, max_objects=None, stats=None, trusted=False):
     """
     Wrapper around :class:`ObjectHook`. Calling this function will configure
     an instance of :class:`ObjectHook` and return a callable suitable for
@@ -471,13 +927,32 @@ def object_hook(handlers=None, as_type=None, validate=True):
         >>> person = json.loads(json_str, object_hook=my_obj_hook)
         >>> # and so does this one ...
         >>> another_person = json.loads(json_str, object_hook=my_obj_hook)                                
+
+    Set ``lazy`` to True to get :class:`LazyObject` proxies back instead of
+    class instances. Nothing is validated or constructed until a proxy is
+    first used, so parts of a large document you never touch cost nothing
+    beyond :func:`json.loads` itself.
+
+    ``max_keys`` limits the number of keys in any one object and
+    ``max_objects`` the number of typed objects (dicts with a ``__type__``)
+    the returned callable will decode over its lifetime. Crossing either
+    raises a :class:`DecodeLimitError`. See :func:`loader` for limits that
+    are checked before parsing starts.
+
+    Pass a :class:`DecodeStats` instance as ``stats`` to record per type
+    decode timings and failures.
+
+    Set ``trusted`` to True to build instances of classes using a generated
+    handler with :class:`TrustedObjectHandler`, bypassing ``__init__``.
+    Classes with a handler of their own are not affected.
     """
     if handlers:
-        _object_handlers = _default_object_handlers.copy()
+        _object_handlers = _default_object_handlers.overlay()
         for name, handler_dict in items(handlers):
             if name in _object_handlers:
                 _object_handlers.update_handler(name, **handler_dict)
             else:
+                handler_dict = dict(handler_dict)
                 _object_handlers.add_handler(
                     handler_dict.pop('cls'),
                     **handler_dict
@@ -485,21 +960,262 @@ def object_hook(handlers=None, as_type=None, validate=True):
     else:
         _object_handlers = _default_object_handlers
                
-    decode = ObjectHook(_object_handlers, validate)
+    decode = ObjectHook(_object_handlers, validate, lazy, max_objects, stats,
+                        trusted, max_keys)
 
     def handler(obj):
+        if max_keys is not None and len(obj) > max_keys:
+            raise _too_many_keys(max_keys)
         if as_type and "__type__" not in obj:
             obj["__type__"] = as_type
         return decode.decode_obj(obj)
 
+    handler.decoder = decode
     return handler
 
 
+def decode_many(objs, type_name, handlers=None, validate=True, **kw):
+    """
+    Decode a list of python dicts (already loaded from JSON) that all
+    represent ``type_name``. Equivalent to, but quicker than, decoding each
+    one with ``as_type=type_name`` ::
+
+        >>> people = decode_many(json.loads(json_str), "Person")
+
+    Dicts nested inside the items are decoded first, as they would be by
+    :func:`loader` with ``as_type=type_name``. ``handlers`` and ``validate`` and the remaining ``kw``
+    args are the same as for :func:`object_hook`. Like ``as_type``, a
+    ``__type__`` key is added to dicts that do not have one.
+    """
+    hook = object_hook(handlers, type_name, validate, **kw)
+    return hook.decoder.decode_many(_apply_hook_below(objs, hook), type_name)
+
+
+def _key_limit(max_keys):
+    """
+    Return an ``object_hook`` that only checks ``max_keys``.
+    """
+    def check(obj):
+        if len(obj) > max_keys:
+            raise _too_many_keys(max_keys)
+        return obj
+    return check
+
+
+def _too_many_keys(max_keys):
+    return DecodeLimitError(
+        "Object has more than {0} keys.".format(max_keys),
+        "max_keys", max_keys
+    )
+
+
+if PY3k:
+    from itertools import accumulate as _accumulate
+else:
+    def _accumulate(iterable):
+        total = 0
+        for value in iterable:
+            total += value
+            yield total
+
+# JSON strings, so brackets and commas inside them can be removed first.
+_STRINGS = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_NOT_BRACKET = re.compile(r'[^\[\]{}]+')
+_NOT_STRUCTURE = re.compile(r'[^\[\]{},]+')
+_DEPTH = {"[": 1, "{": 1, "]": -1, "}": -1}
+
+# Matches JSON strings and the structural characters that open, close and
+# separate containers.
+_STRUCTURE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{},]')
+
+
+def _check_structure(text, max_depth=None, max_items=None):
+    """
+    Raise a :class:`DecodeLimitError` if nesting in ``text`` goes deeper
+    than ``max_depth`` or an array holds more than ``max_items`` items.
+    Nothing is built: strings are cut out and the rest reduced to brackets
+    (and commas, for ``max_items``) with regular expressions. The depth is
+    then summed up in C, only counting items takes a python loop over the
+    reduced text.
+    """
+    stripped = _STRINGS.sub("", text)
+    if max_depth is not None:
+        brackets = _NOT_BRACKET.sub("", stripped)
+        if brackets and max(_accumulate(map(_DEPTH.__getitem__,
+                                            brackets))) > max_depth:
+            _locate_limit(text, max_depth, None)
+    if max_items is not None:
+        # Item counts of the open arrays, None for open objects.
+        stack = []
+        for char in _NOT_STRUCTURE.sub("", stripped):
+            if char == ",":
+                if stack and stack[-1] is not None:
+                    stack[-1] += 1
+                    if stack[-1] >= max_items:
+                        _locate_limit(text, None, max_items)
+            elif char == "[":
+                stack.append(0)
+            elif char == "{":
+                stack.append(None)
+            elif stack:
+                stack.pop()
+
+
+def _locate_limit(text, max_depth, max_items):
+    """
+    Scan ``text`` again, one structural character at a time, and raise the :class:`DecodeLimitError`
+    :func:`_check_structure` found, with the position it happens at.
+    """
+    # Each entry is [opening char, number of commas seen so far].
+    stack = []
+    for match in _STRUCTURE.finditer(text):
+        char = match.group()
+        if char == ",":
+            if stack and stack[-1][0] == "[":
+                stack[-1][1] += 1
+                if max_items is not None and stack[-1][1] >= max_items:
+                    raise DecodeLimitError(
+                        "Array has more than {0} items.".format(max_items),
+                        "max_items", max_items, position=match.start()
+                    )
+        elif char == "[" or char == "{":
+            stack.append([char, 0])
+            if max_depth is not None and len(stack) > max_depth:
+                raise DecodeLimitError(
+                    "Nesting depth exceeds {0}.".format(max_depth),
+                    "max_depth", max_depth, position=match.start()
+                )
+        elif char == "]" or char == "}":
+            if stack:
+                stack.pop()
+
+
+#: Default number of distinct strings an :class:`_InternTable` will hold.
+INTERN_LIMIT = 10000
+
+
+def _scanner_shares_keys():
+    # The json scanner of python 3 memoizes object keys during each call,
+    # so equal keys are already the same object.
+    a, b = json.loads('[{"key": 1}, {"key": 2}]')
+    return next(iter(a)) is next(iter(b))
+
+
+_SCANNER_SHARES_KEYS = _scanner_shares_keys()
+
+
+class _InternTable(object):
+    """
+    Bounded table of strings shared during a single :func:`loader` call.
+    Once ``limit`` distinct strings have been seen, new strings are passed
+    through untouched.
+    """
+    def __init__(self, keys, values, limit):
+        self.keys = keys
+        if values is None or callable(values):
+            self.values = values
+        else:
+            self.values = frozenset(values).__contains__
+        self.limit = limit
+        self.table = {}
+
+    def intern(self, string):
+        try:
+            return self.table[string]
+        except KeyError:
+            if len(self.table) < self.limit:
+                self.table[string] = string
+            return string
+
+    def pairs_hook(self, hook):
+        """
+        Return an ``object_pairs_hook`` that interns keys and values and
+        hands the resulting dict to ``hook``.
+        """
+        intern = self.intern
+        keys = self.keys
+        values = self.values
+
+        def pairs_hook(pairs):
+            obj = {}
+            for key, value in pairs:
+                if keys:
+                    key = intern(key)
+                if values and isinstance(value, basestring) and values(value):
+                    value = intern(value)
+                obj[key] = value
+            return hook(obj)
+
+        return pairs_hook
+
+
+def _size(json_str):
+    if isinstance(json_str, memoryview):
+        return json_str.nbytes
+    return len(json_str)
+
+
+def _detect_encoding(b):
+    """
+    Python 2 port of :func:`json.detect_encoding`.
+    """
+    if b.startswith((codecs.BOM_UTF32_BE, codecs.BOM_UTF32_LE)):
+        return "utf-32"
+    if b.startswith((codecs.BOM_UTF16_BE, codecs.BOM_UTF16_LE)):
+        return "utf-16"
+    if b.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    b = bytearray(b[:4])
+    if len(b) >= 4:
+        if not b[0]:
+            return "utf-16-be" if b[1] else "utf-32-be"
+        if not b[1]:
+            return "utf-16-le" if b[2] or b[3] else "utf-32-le"
+    elif len(b) == 2:
+        if not b[0]:
+            return "utf-16-be"
+        if not b[1]:
+            return "utf-16-le"
+    return "utf-8"
+
+
+def _to_text(json_str):
+    """
+    Turn ``bytes``, ``bytearray``, ``memoryview`` or ``mmap`` input into a
+    ``str`` the json scanner can parse. The text is decoded straight out of
+    the underlying buffer so no intermediate ``bytes`` copy is made.
+
+    Python 2 has no buffer view of an ``mmap`` and its scanner only reads
+    utf-8, so there the bytes are copied out and anything else is decoded.
+    """
+    if not PY3k:
+        if isinstance(json_str, basestring):
+            if not isinstance(json_str, str):
+                return json_str
+        elif isinstance(json_str, mmap.mmap):
+            json_str = json_str[:]
+        else:
+            json_str = memoryview(json_str).tobytes()
+        encoding = _detect_encoding(json_str)
+        if encoding == "utf-8":
+            return json_str
+        return json_str.decode(encoding)
+    if isinstance(json_str, str):
+        return json_str
+    with memoryview(json_str) as view:
+        encoding = json.detect_encoding(view[:4].tobytes())
+        return str(view, encoding)
+
+
 def loader(json_str, **kw):
     """
     Call this function as you would call :func:`json.loads`. It wraps the
     :ref:`object_hook` interface and returns python class instances from JSON
     strings.
+
+    ``json_str`` may also be ``bytes``, a ``bytearray``, a ``memoryview`` or
+    an :class:`mmap.mmap`. The encoding (utf-8, utf-16 or utf-32) is detected
+    the same way :func:`json.loads` does it.
     
     :param ensure_type: Check that the resulting object is of type
         ``ensure_type``. Raise a ValidationError otherwise.          
@@ -508,29 +1224,429 @@ def loader(json_str, **kw):
         represents. see :func:`object_hook`    
     :param validate: Set to False to turn off validation (ie dont run the
         schemas) during this load operation. Defaults to True.    
+    :param lazy: Return :class:`LazyObject` proxies that validate and
+        construct on first use. see :func:`object_hook`.
+    :param intern_keys: Set to True to share one ``str`` object between
+        equal object keys. The json scanner of python 3 already does this
+        for every document, so there it changes nothing.
+    :param intern_values: A set of strings, or a callable returning True for
+        strings, that should be shared between equal object values. Handy for
+        enum like values and ``__type__`` names.
+    :param intern_limit: Maximum number of distinct strings shared during
+        this load operation. Defaults to :data:`INTERN_LIMIT`.
+    :param select: A JSON Pointer (RFC 6901) such as ``"/payload/items"``.
+        Only the value it points to is returned, and only that value is run
+        through the object hook. Dicts outside of it are left alone, so
+        their ``__type__`` is never looked up, validated or constructed.
+    :param id_key: Turn on reference resolution. Objects with this key (for
+        example ``"id"``) are decoded once and every object holding just a
+        ``ref_key`` with the same id decodes to that same instance, wherever
+        it appears in the document. See :class:`ObjectReferenceError`.
+    :param ref_key: The key of reference objects. Defaults to ``"$ref"``.
+    :param batch: When the document is a list and ``as_type`` is given,
+        decode its items with :meth:`ObjectHook.decode_many`.
+    :param max_size: Refuse documents longer than this many bytes (or
+        characters when ``json_str`` is a ``str``).
+    :param max_depth: Refuse documents nested deeper than this.
+    :param max_items: Refuse documents with an array holding more items
+        than this.
+    :param max_keys: Refuse documents with an object holding more keys
+        than this.
+    :param max_objects: Stop decoding once more than this many typed
+        objects have been seen.
+    :param stats: A :class:`DecodeStats` to record timings to. see
+        :func:`object_hook`.
+    :param trusted: Skip ``__init__`` when constructing instances. Only use
+        this for data you trust. see :func:`object_hook`.
+    :param fail_fast: Raise the first :class:`ValidationError` found
+        without validating the rest of the object. see
+        :meth:`~jsonweb.validators.BaseValidator.validate`.
+    :param max_errors: Stop validating an object after this many errors.
     :param kw: the rest of the kw args will be passed to the underlying
         :func:`json.loads` calls.
+
+    All of the ``max_*`` limits raise a :class:`DecodeLimitError`. The size
+    limit is checked first. The depth and item limits are checked by a scan
+    over the raw document before :func:`json.loads` builds anything, which
+    only runs when one of them is given. It takes about twice as long as
+    :func:`json.loads` takes to parse the same document for ``max_depth``,
+    three times as long for ``max_items``. The key limit is checked for
+    every object in the document as it is parsed, even with ``select``, and
+    the object limit as each typed object is decoded.
     
     
     """
-    kw["object_hook"] = object_hook(
+    fail_fast = kw.pop("fail_fast", False)
+    max_errors = kw.pop("max_errors", None)
+    if fail_fast or max_errors is not None:
+        with _limit_errors(fail_fast, max_errors):
+            return loader(json_str, **kw)
+
+    max_size = kw.pop("max_size", None)
+    max_depth = kw.pop("max_depth", None)
+    max_items = kw.pop("max_items", None)
+    max_keys = kw.pop("max_keys", None)
+
+    as_type = kw.pop("as_type", None)
+    hook = object_hook(
         kw.pop("handlers", None),
-        kw.pop("as_type", None),
-        kw.pop("validate", True)
+        as_type,
+        kw.pop("validate", True),
+        kw.pop("lazy", False),
+        max_objects=kw.pop("max_objects", None),
+        stats=kw.pop("stats", None),
+        trusted=kw.pop("trusted", False),
+        max_keys=max_keys
     )
+
+    intern_keys = kw.pop("intern_keys", False) and not _SCANNER_SHARES_KEYS
+    intern_values = kw.pop("intern_values", None)
+    intern_limit = kw.pop("intern_limit", INTERN_LIMIT)
+    if intern_keys or intern_values:
+        pairs_hook = _InternTable(
+            intern_keys, intern_values, intern_limit
+        ).pairs_hook(hook)
+    else:
+        pairs_hook = None
+
+    select = kw.pop("select", None)
+    id_key = kw.pop("id_key", None)
+    ref_key = kw.pop("ref_key", "$ref")
+    batch = kw.pop("batch", False) and as_type and not pairs_hook
+    # Selecting a subtree, resolving references or batch decoding means
+    # running the hook ourselves once json.loads is done.
+    post_hook = select is not None or id_key is not None or batch
+    if not post_hook:
+        if pairs_hook:
+            kw["object_pairs_hook"] = pairs_hook
+        else:
+            kw["object_hook"] = hook
+    elif max_keys is not None:
+        # The hook may only see part of the document afterwards, so the
+        # key limit is checked for every object while parsing.
+        kw["object_hook"] = _key_limit(max_keys)
     
     ensure_type = kw.pop("ensure_type", _as_type_context.top)
     
+    if max_size is not None and _size(json_str) > max_size:
+        raise DecodeLimitError(
+            "Document is larger than {0}.".format(max_size),
+            "max_size", max_size
+        )
+
     try:
+        json_str = _to_text(json_str)
+        if max_depth is not None or max_items is not None:
+            _check_structure(json_str, max_depth, max_items)
         obj = json.loads(json_str, **kw)
     except ValueError as e:
         raise JsonDecodeError(e.args[0])
+
+    if post_hook:
+        if pairs_hook:
+            hook = lambda d: pairs_hook(list(items(d)))
+        root = obj
+        if select is not None:
+            obj = _select(obj, select)
+        if id_key is not None:
+            obj = _RefResolver(root, hook, id_key, ref_key).decode(obj)
+        elif batch and isinstance(obj, list):
+            # A document of objects with no more "{" than items cannot have
+            # objects nested inside them, so there is nothing to walk.
+            if obj is not root or json_str.count("{") > len(obj) \
+                    or set(map(type, obj)) - set([dict]):
+                obj = _apply_hook_below(obj, hook)
+            obj = hook.decoder.decode_many(obj, as_type)
+        else:
+            obj = _apply_hook(obj, hook)
     
     if ensure_type:
         return EnsureType(ensure_type).validate(obj)
     return obj
 
 
+class _RefResolver(object):
+    """
+    Runs an object hook bottom up over plain decoded JSON (like
+    :func:`_apply_hook`) while keeping an identity table of objects keyed by
+    their ``__type__`` and ``id_key``. ``{ref_key: id}`` objects are
+    replaced by the instance with that id, and may carry a ``__type__`` to
+    pick between objects of different types sharing an id. Forward
+    references are handled by decoding the target, found in an index of the
+    whole document, as soon as it is first referenced.
+    """
+    def __init__(self, root, hook, id_key, ref_key):
+        self.hook = hook
+        self.id_key = id_key
+        self.ref_key = ref_key
+        # (__type__, id) -> raw dict, decoded instance.
+        self.raw = {}
+        self.decoded = {}
+        self.pending = set()
+        # id -> [(__type__, id), ...] for references without a __type__.
+        self.types = {}
+        self.index(root)
+
+    def key(self, obj, obj_id):
+        try:
+            hash(obj_id)
+        except TypeError:
+            raise ObjectReferenceError(
+                "Invalid reference id {0!r}.".format(obj_id), obj_id
+            )
+        return obj.get("__type__"), obj_id
+
+    def index(self, obj):
+        if isinstance(obj, dict):
+            if self.id_key in obj and self.ref_key not in obj:
+                obj_id = obj[self.id_key]
+                key = self.key(obj, obj_id)
+                if key not in self.raw:
+                    self.raw[key] = obj
+                    self.types.setdefault(obj_id, []).append(key)
+            values = obj.values()
+        elif isinstance(obj, list):
+            values = obj
+        else:
+            return
+        for value in values:
+            if isinstance(value, (dict, list)):
+                self.index(value)
+
+    def decode(self, obj):
+        if isinstance(obj, list):
+            for i, value in enumerate(obj):
+                if isinstance(value, (dict, list)):
+                    obj[i] = self.decode(value)
+            return obj
+        if not isinstance(obj, dict):
+            return obj
+        if self.ref_key in obj:
+            return self.resolve(obj)
+        if self.id_key not in obj:
+            return self.decode_dict(obj)
+
+        obj_id = obj[self.id_key]
+        key = self.key(obj, obj_id)
+        if key in self.decoded:
+            return self.decoded[key]
+        if key in self.pending:
+            raise ObjectReferenceError(
+                "Circular reference to {0!r}.".format(obj_id), obj_id
+            )
+        self.pending.add(key)
+        self.decoded[key] = instance = self.decode_dict(obj)
+        self.pending.discard(key)
+        return instance
+
+    def decode_dict(self, obj):
+        for key, value in items(obj):
+            if isinstance(value, (dict, list)):
+                obj[key] = self.decode(value)
+        return self.hook(obj)
+
+    def resolve(self, ref):
+        obj_id = ref[self.ref_key]
+        key = self.key(ref, obj_id)
+        if key[0] is None:
+            # Untyped references match an object of any type.
+            keys = self.types.get(obj_id, ())
+            if len(keys) > 1:
+                raise ObjectReferenceError(
+                    "Ambiguous reference to {0!r}, add a __type__.".format(
+                        obj_id), obj_id
+                )
+            if keys:
+                key = keys[0]
+        if key in self.decoded:
+            return self.decoded[key]
+        try:
+            target = self.raw[key]
+        except KeyError:
+            raise ObjectReferenceError(
+                "Unresolved reference to {0!r}.".format(obj_id), obj_id
+            )
+        return self.decode(target)
+
+
+# RFC 6901 array indexes: no sign and no leading zeros.
+_ARRAY_INDEX = re.compile(r"(?:0|[1-9][0-9]*)\Z")
+
+
+def _select(obj, pointer):
+    """
+    Return the value in ``obj`` that the JSON Pointer ``pointer`` refers to.
+    """
+    if not pointer:
+        return obj
+    if not pointer.startswith("/"):
+        raise JsonDecodeError("Invalid JSON pointer {0!r}.".format(pointer),
+                              pointer=pointer)
+    for token in pointer[1:].split("/"):
+        token = token.replace("~1", "/").replace("~0", "~")
+        try:
+            if isinstance(obj, list):
+                if not _ARRAY_INDEX.match(token):
+                    raise IndexError(token)
+                obj = obj[int(token)]
+            else:
+                obj = obj[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise JsonDecodeError(
+                "JSON pointer {0!r} does not exist.".format(pointer),
+                pointer=pointer
+            )
+    return obj
+
+
+def _apply_hook(obj, hook):
+    """
+    Run ``hook`` over every dict in ``obj`` bottom up, the same order
+    :func:`json.loads` calls ``object_hook`` in.
+    """
+    if isinstance(obj, dict):
+        for key, value in items(obj):
+            if isinstance(value, (dict, list)):
+                obj[key] = _apply_hook(value, hook)
+        return hook(obj)
+    if isinstance(obj, list):
+        for i, value in enumerate(obj):
+            if isinstance(value, (dict, list)):
+                obj[i] = _apply_hook(value, hook)
+    return obj
+
+
+def _apply_hook_below(objs, hook):
+    """
+    :func:`_apply_hook` for everything nested inside the items of the list
+    ``objs``, but not for the items themselves.
+    """
+    for i, obj in enumerate(objs):
+        if obj.__class__ is dict:
+            for key, value in items(obj):
+                if value.__class__ is dict or value.__class__ is list:
+                    obj[key] = _apply_hook(value, hook)
+        elif obj.__class__ is list:
+            objs[i] = _apply_hook(obj, hook)
+    return objs
+
+
+def load_file(path, **kw):
+    """
+    Decode the JSON file at ``path``. The file is memory mapped and handed
+    to :func:`loader` so its contents are never read into an intermediate
+    ``bytes`` object. Accepts the same kw args as :func:`loader`.
+    """
+    with open(path, "rb") as f:
+        if not os.fstat(f.fileno()).st_size:
+            # Empty files cannot be mapped, let loader complain instead.
+            return loader("", **kw)
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return loader(mapped, **kw)
+        finally:
+            mapped.close()
+
+
+def _line_ranges(path, chunks):
+    """
+    Split the file at ``path`` into at most ``chunks`` ``(start, end)`` byte
+    ranges. Every range starts at the beginning of a line and ends just after
+    a newline (or at EOF) so no line is ever split between two ranges.
+    """
+    size = os.path.getsize(path)
+    step = max(size // chunks, 1)
+    bounds = [0]
+    with open(path, "rb") as f:
+        while bounds[-1] + step < size:
+            f.seek(bounds[-1] + step)
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _load_line_range(args):
+    """
+    Worker for :func:`parallel_load_lines`. Decode every non blank line in
+    the byte range ``start`` - ``end`` of ``path`` with :func:`loader`.
+    """
+    path, start, end, kw = args
+    objs = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        while f.tell() < end:
+            line = f.readline().strip()
+            if line:
+                objs.append(loader(line, **kw))
+    return objs
+
+
+def _init_worker(handlers):
+    """
+    Pool initializer for :func:`parallel_load_lines`. Replace the handlers
+    of a worker process with those registered in the parent.
+    """
+    _default_object_handlers.clear()
+    for name, handler_tuple in handlers:
+        _default_object_handlers.set(name, handler_tuple)
+
+
+def parallel_load_lines(path, workers=None, ordered=True,
+                        chunks_per_worker=4, context=None, **kw):
+    """
+    Decode a newline delimited JSON (NDJSON) file using a pool of worker
+    processes. Returns a generator yielding one decoded object per non blank
+    line of the file ::
+
+        >>> for person in parallel_load_lines("people.ndjson", workers=4):
+        ...     print(person.first_name)
+
+    The file is split into byte ranges on newline boundaries and each range is
+    decoded by a worker process with :func:`loader`. Workers use the handlers
+    registered with :func:`from_object` in the parent process, whatever the
+    start method of the pool. Unless it forks, these handlers (their
+    classes, handler functions and schemas) are pickled to reach the
+    workers, so they must be defined at module level. Anything passed to
+    ``handlers`` must be picklable.
+
+    :param workers: Number of worker processes. Defaults to
+        :func:`multiprocessing.cpu_count`.
+    :param ordered: When True (the default) objects are yielded in file order.
+        When False each range is yielded as soon as a worker finishes it.
+    :param chunks_per_worker: How many byte ranges to create per worker.
+        Smaller ranges stream results back sooner.
+    :param context: A :mod:`multiprocessing` context, or the name of a start
+        method such as ``"spawn"``, to create the pool with. Defaults to
+        the :mod:`multiprocessing` default.
+    :param kw: the rest of the kw args are passed to :func:`loader`.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    # ``ensure_type`` normally comes from the calling context, which the
+    # worker processes cannot see.
+    kw.setdefault("ensure_type", _as_type_context.top)
+
+    ranges = _line_ranges(path, workers * chunks_per_worker)
+    tasks = [(path, start, end, kw) for start, end in ranges]
+
+    if isinstance(context, basestring):
+        context = multiprocessing.get_context(context)
+    pool = (context or multiprocessing).Pool(
+        workers, _init_worker, (list(_default_object_handlers),)
+    )
+    try:
+        imap = ordered and pool.imap or pool.imap_unordered
+        for objs in imap(_load_line_range, tasks):
+            for obj in objs:
+                yield obj
+    finally:
+        pool.terminate()
+        pool.join()
+
+
 @contextmanager
 def ensure_type(cls):
     """
@@ -585,6 +1701,10 @@ def ensure_type(cls):
     The above example is pretty contrived. We could have just made ``load_json_request``
     accept an ``ensure_type`` kw, but imagine if the call to :func:`loader` was burried 
     deeper in our api and such a thing was not possible.
+
+    The active type is tracked with :mod:`contextvars` (falling back to a
+    thread local on pythons without it), so concurrent asyncio tasks on the
+    same thread each see only their own :func:`ensure_type` blocks.
     """
     _as_type_context.push(cls)
     try:
@@ -1,4 +1,17 @@
+def _rebuild_error(cls, args, state):
+    exc = Exception.__new__(cls)
+    exc.args = args
+    exc.__dict__.update(state)
+    return exc
+
+
 class JsonWebError(Exception):
     def __init__(self, message, **extras):
         Exception.__init__(self, message)
-        self.extras = extras
\ No newline at end of file
+        self.extras = extras
+
+    def __reduce__(self):
+        # Subclasses format their message in ``__init__`` and take different
+        # arguments, so rebuild them without calling ``__init__`` again. This
+        # lets errors raised in worker processes cross back to the parent.
+        return _rebuild_error, (self.__class__, self.args, self.__dict__)
@@ -10,10 +10,16 @@ PY3k = sys.version_info[0] == 3
 if PY3k:
     basestring = (str, bytes)
     _iteritems = "items"
+    _viewkeys = "keys"
 else:
     basestring = basestring
     _iteritems = "iteritems"
+    _viewkeys = "viewkeys"
 
 
 def items(d):
-    return getattr(d, _iteritems)()
\ No newline at end of file
+    return getattr(d, _iteritems)()
+
+
+def keys(d):
+    return getattr(d, _viewkeys)()
@@ -104,21 +104,85 @@ are not valid python identifiers (e.g "first-name")::
 
 """
 
-from jsonweb.py3k import PY3k, items
-from jsonweb.validators import BaseValidator, _Errors, ValidationError, \
-    isinstance_or_raise
+import keyword
+import re
+from collections import namedtuple
 
+from jsonweb import encode
+from jsonweb.exceptions import JsonWebError
+from jsonweb.py3k import PY3k, basestring, items
+from jsonweb.validators import BaseValidator, _Errors, _INVALID, \
+    _collector, _type_failure, _validate_collecting, ValidationError, \
+    String, Integer, Float, Boolean, Number
 
-class SchemaMeta(type):
-    def __new__(mcs, cls_name, bases, cls_dict):
-        cls_dict["_fields"] = [k for k, v in items(cls_dict)
-                               if hasattr(v, "_validate")]
 
-        for base in bases:
-            if hasattr(base, "_fields"):
-                cls_dict["_fields"].extend(base._fields)
+# Field names a record class can use as attributes.
+_RECORD_FIELD = re.compile(r"[A-Za-z][A-Za-z0-9_]*\Z")
+
+
+def _unique(fields):
+    seen = set()
+    for field in fields:
+        if field not in seen:
+            seen.add(field)
+            yield field
+
 
-        return type.__new__(mcs, cls_name, bases, cls_dict)
+def _class_attribute(cls, name):
+    # ``name`` as stored in the class dict, without calling ``__get__``.
+    for klass in cls.__mro__:
+        if name in vars(klass):
+            return vars(klass)[name]
+
+
+class SchemaMeta(type):
+    """
+    Collects the validators of a schema class into ``_fields``, the field
+    names (the class's own first, then those inherited from each base), and
+    ``_field_specs``, a matching tuple of
+    ``(name, validator, required, default, nullable)`` tuples. A field
+    overridden in a subclass appears once, with the subclass's validator.
+
+    Both are rebuilt, for the class and its subclasses, when a validator is
+    assigned to or deleted from the class.
+    """
+    def __new__(mcs, cls_name, bases, cls_dict):
+        cls = type.__new__(mcs, cls_name, bases, cls_dict)
+        cls._build_fields()
+        return cls
+
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+        if hasattr(value, "_validate") or name in cls._fields:
+            cls._rebuild_fields()
+
+    def __delattr__(cls, name):
+        type.__delattr__(cls, name)
+        if name in cls._fields:
+            cls._rebuild_fields()
+
+    def _build_fields(cls):
+        fields = [k for k, v in items(vars(cls)) if hasattr(v, "_validate")]
+        for base in cls.__bases__:
+            fields.extend(getattr(base, "_fields", ()))
+        fields = list(_unique(fields))
+
+        specs = []
+        for name in fields:
+            # Not getattr, EnsureType given a class name resolves it then.
+            v = _class_attribute(cls, name)
+            specs.append((name, v, v.required, v.default, v.nullable))
+
+        type.__setattr__(cls, "_fields", fields)
+        type.__setattr__(cls, "_field_specs", tuple(specs))
+        # Each schema class compiles its own collect function on first use.
+        type.__setattr__(cls, "_compiled_collect", None)
+
+    def _rebuild_fields(cls):
+        cls._build_fields()
+        for subclass in type.__subclasses__(cls):
+            if isinstance(subclass, SchemaMeta):
+                subclass._rebuild_fields()
 
 
 class ObjectSchema(BaseValidator):
@@ -136,36 +200,245 @@ class ObjectSchema(BaseValidator):
         schema_dict.update(dict(vars(ObjectSchema)))
         return SchemaMeta(name, (ObjectSchema,), schema_dict)
 
+    @classmethod
+    def record_class(cls, type_name, as_tuple=False, register=True):
+        """
+        Generate a compact record class with one attribute per field of this
+        schema. Instances use ``__slots__`` (or are a
+        :func:`~collections.namedtuple` when ``as_tuple`` is True) so they
+        take a fraction of the memory of a dict or a regular class instance.
+
+        Unless ``register`` is False the record class is registered with
+        :func:`~jsonweb.decode.from_object` under ``type_name`` with this
+        schema, so :func:`~jsonweb.decode.loader` decodes straight into
+        records ::
+
+            >>> Person = PersonSchema.record_class("Person")
+            >>> person = loader('{"__type__": "Person", "first_name": "bob"}')
+            >>> person.first_name
+            'bob'
+
+        Optional fields missing from the JSON are set to ``None``. Slot
+        based records are decorated with :func:`~jsonweb.encode.to_object`,
+        tuple based ones encode to JSON lists.
+
+        Every field name must be a valid attribute name (ASCII letters,
+        digits and underscores, not starting with an underscore or digit and
+        not a keyword), otherwise a :class:`~jsonweb.exceptions.JsonWebError`
+        is raised. Schemas with fields like ``"first-name"`` cannot have a
+        record class.
+
+        :param type_name: Name of the generated class and its ``__type__``.
+        :param as_tuple: Generate a namedtuple instead of a slots class.
+        :param register: Register the class as the decode target for
+            ``type_name``.
+        """
+        fields = tuple(cls._fields)
+        for field in fields:
+            if not _RECORD_FIELD.match(field) or keyword.iskeyword(field):
+                raise JsonWebError(
+                    "Cannot generate record class {0}, field {1!r} is not "
+                    "a valid attribute name.".format(type_name, field)
+                )
+        if as_tuple:
+            record = namedtuple(type_name, fields)
+        else:
+            record = encode.to_object(cls_type=type_name)(
+                type(type_name, (_SlotsRecord,),
+                     {"__slots__": fields, "_fields": fields})
+            )
+
+        if register:
+            from jsonweb.decode import from_object
+            from_object(_record_handler, type_name, cls)(record)
+        return record
+
+    @classmethod
+    def compile(cls):
+        """
+        Generate a validation function specialised for this schema and use
+        it from now on. This happens automatically the first time the schema
+        validates something, call it yourself to pay the cost up front.
+
+        The generated function checks each field in one flat block of code.
+        Fields using :class:`~jsonweb.validators.String`,
+        :class:`~jsonweb.validators.Integer`,
+        :class:`~jsonweb.validators.Float`,
+        :class:`~jsonweb.validators.Boolean` or
+        :class:`~jsonweb.validators.Number` (but not subclasses of them) have
+        their type check inlined, and only call the validator when that
+        check fails, so errors are exactly those the validator reports.
+        Every other validator is called as usual.
+
+        Like :class:`~jsonweb.validators.List` and
+        :class:`~jsonweb.validators.Dict`, the function collects errors from
+        nested validators without raising, a single
+        :class:`~jsonweb.validators.ValidationError` is raised by the
+        outermost one.
+
+        Validators are read when the schema is compiled. Assigning a new
+        validator to the class discards the compiled function, but if you
+        change the attributes of one afterwards call :meth:`compile` again.
+        """
+        collect = _compile_schema(cls)
+        cls._compiled_collect = staticmethod(collect)
+        return collect
+
     def to_json(self):
         return super(ObjectSchema, self).to_json(
             fields=dict([(f, getattr(self, f)) for f in self._fields])
         )
 
     def _validate(self, obj):
-        isinstance_or_raise(obj, dict)
-        val_obj = {}
-        errors = _Errors({})
-
-        for field in self._fields:
-            v = getattr(self, field)
-            try:
-                if field not in obj:
-                    if v.default is not None:
-                        val_obj[field] = v.default
-                    elif v.required:
-                        errors.add_error(
-                            "Missing required parameter.",
-                            key=field,
-                            error_type="required_but_missing"
-                        )
-                else:
-                    val_obj[field] = v.validate(obj[field])
-            except ValidationError as e:
-                errors.add_error(e, key=field)
-
-        errors.raise_if_errors("Error validating object.",
-                               error_type="invalid_object")
-        return val_obj
+        return _validate_collecting(self, obj)
+
+    def _collect(self, obj, sink):
+        collect = self._compiled_collect or self.compile()
+        return collect(self, obj, sink)
+
+
+class _SlotsRecord(object):
+    """
+    Base class for records generated by :meth:`ObjectSchema.record_class`.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, *args):
+        for field, value in zip(self._fields, args):
+            setattr(self, field, value)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(
+            getattr(self, f) == getattr(other, f) for f in self._fields
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, ", ".join(
+            "{0}={1!r}".format(f, getattr(self, f)) for f in self._fields
+        ))
+
+
+def _record_handler(cls, obj):
+    get = obj.get
+    return cls(*[get(f) for f in cls._fields])
+
+
+# Validators whose ``_validate`` is nothing more than an isinstance check
+# (plus length checks for String) mapped to the types they check.
+_INLINE_TYPES = {
+    String: basestring,
+    Integer: int,
+    Float: float,
+    Boolean: bool,
+    Number: (float, int),
+}
+
+
+def _inline_check(v, nullable, namespace, n):
+    """
+    Return a python expression that is True when ``value`` certainly passes
+    the validator ``v``, or None if ``v`` cannot be inlined.
+    """
+    if type(v) not in _INLINE_TYPES:
+        return None
+    namespace["t{0}".format(n)] = _INLINE_TYPES[type(v)]
+    check = "isinstance(value, t{0})".format(n)
+    if type(v) is String:
+        if v.min_len:
+            check += " and len(value) >= {0!r}".format(v.min_len)
+        if v.max_len:
+            check += " and len(value) <= {0!r}".format(v.max_len)
+    if nullable:
+        check = "value is None or {0}".format(check)
+    return check
+
+
+def _compile_schema(cls):
+    """
+    Build the ``_collect`` function used by :meth:`ObjectSchema.compile`. It
+    behaves like looping over ``cls._field_specs`` and calling each
+    validator.
+    """
+    namespace = {
+        "_INVALID": _INVALID,
+        "_Errors": _Errors,
+        "_collector": _collector,
+        "_type_failure": _type_failure,
+    }
+    lines = [
+        "def collect(self, obj, sink):",
+        "    if obj is None:",
+        "        return self._collect_null(sink)",
+        "    if not isinstance(obj, dict):",
+        "        sink.append(_type_failure(obj, dict))",
+        "        return _INVALID",
+        "    val_obj = {}",
+        "    errors = None",
+    ]
+    add_error = [
+        "if errors is None:",
+        "    errors = _Errors({})",
+    ]
+    fail = [
+        "sink.append(errors.failure('Error validating object.', "
+        "error_type='invalid_object'))",
+        "return _INVALID",
+    ]
+    fail_if_full = ["if errors.full:"] + ["    " + line for line in fail]
+
+    def emit(indent, *code):
+        lines.extend(" " * indent + line for line in code)
+
+    for n, (field, v, required, default, nullable) in \
+            enumerate(cls._field_specs):
+        key = repr(field)
+        # Validators that resolve to something else when looked up
+        # (EnsureType given a class name) must be looked up on every call
+        # to pick up registry changes.
+        if getattr(cls, field) is not v:
+            call = "_collector(getattr(self, {0}))(value, sink)".format(key)
+        else:
+            namespace["c{0}".format(n)] = _collector(v)
+            call = "c{0}(value, sink)".format(n)
+
+        emit(4, "if {0} in obj:".format(key), "    value = obj[{0}]".format(key))
+        check = _inline_check(v, nullable, namespace, n)
+        indent = 8
+        if check:
+            emit(8, "if {0}:".format(check),
+                 "    val_obj[{0}] = value".format(key),
+                 "else:")
+            indent = 12
+        emit(indent, "value = {0}".format(call),
+             "if value is _INVALID:")
+        emit(indent + 4, *add_error)
+        emit(indent + 4, "errors.add_error(sink.pop(), key={0})".format(key))
+        emit(indent + 4, *fail_if_full)
+        emit(indent, "else:", "    val_obj[{0}] = value".format(key))
+
+        if default is not None:
+            namespace["d{0}".format(n)] = default
+            emit(4, "else:", "    val_obj[{0}] = d{1}".format(key, n))
+        elif required:
+            emit(4, "else:")
+            emit(8, *add_error)
+            emit(8, "errors.add_error('Missing required parameter.', "
+                    "key={0}, error_type='required_but_missing')".format(key))
+            emit(8, *fail_if_full)
+
+    emit(4, "if errors is not None:")
+    emit(8, *fail)
+    emit(4, "return val_obj")
+
+    filename = "<compiled schema {0}>".format(cls.__name__)
+    exec(compile("\n".join(lines), filename, "exec"), namespace)
+    return namespace["collect"]
 
 
 def bind_schema(type_name, schema_obj):
@@ -0,0 +1,104 @@
+import asyncio
+import json
+import unittest
+
+from jsonweb import from_object
+from jsonweb.aio import aload_stream
+from jsonweb.decode import JsonDecodeError
+from jsonweb.validators import ValidationError
+
+
+def collect(data, **kw):
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return [obj async for obj in aload_stream(reader, **kw)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(run())
+    finally:
+        loop.close()
+
+
+class TestAloadStream(unittest.TestCase):
+    def setUp(self):
+        from jsonweb.decode import _default_object_handlers
+        _default_object_handlers.clear()
+
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        self.Person = Person
+
+    def test_stream_of_documents(self):
+        data = (b'{"__type__": "Person", "first_name": "shawn", '
+                b'"last_name": "adams"}\n'
+                b'12345\n"caf\xc3\xa9" [1, 2]\n')
+        # A tiny chunk_size splits values, numbers and utf-8 sequences.
+        for chunk_size in (1, 7, 1024):
+            objs = collect(data, chunk_size=chunk_size)
+            self.assertTrue(isinstance(objs[0], self.Person))
+            self.assertEqual(objs[1:], [12345, u"caf\xe9", [1, 2]])
+
+    def test_items_of_top_level_array(self):
+        data = (b' [ {"first_name": "shawn", "last_name": "adams"},\n'
+                b'{"first_name": "luke", "last_name": "skywalker"} ] ')
+        for chunk_size in (1, 5, 1024):
+            objs = collect(data, items=True, as_type="Person",
+                           chunk_size=chunk_size, slice_size=1)
+            self.assertEqual([p.first_name for p in objs], ["shawn", "luke"])
+
+        self.assertEqual(collect(b"[]", items=True), [])
+
+    def test_numbers_split_across_chunks(self):
+        for chunk_size in range(1, 8):
+            self.assertEqual(collect(b"1.5\n2.5\n-3e-2 4E+1",
+                                     chunk_size=chunk_size),
+                             [1.5, 2.5, -0.03, 40.0])
+            self.assertEqual(collect(b"[1.5, 1e5, 10]", items=True,
+                                     chunk_size=chunk_size),
+                             [1.5, 100000.0, 10])
+
+    def test_hook_runs_once_per_object(self):
+        calls = []
+
+        def handler(cls, obj):
+            calls.append(obj["first_name"])
+            return cls(obj["first_name"], obj["last_name"])
+
+        data = json.dumps([{"first_name": str(i), "last_name": "x"}
+                           for i in range(200)]).encode("utf-8")
+        objs = collect(data, as_type="Person", chunk_size=64,
+                       handlers={"Person": {"handler": handler}})
+        self.assertEqual(len(objs[0]), 200)
+        self.assertEqual(len(calls), 200)
+
+    def test_handler_errors_are_not_mistaken_for_partial_values(self):
+        def handler(cls, obj):
+            raise ValueError("bad person")
+
+        data = b'{"first_name": "a", "last_name": "b"} {"__type__": '
+        with self.assertRaises(ValueError) as c:
+            collect(data, as_type="Person", chunk_size=1024,
+                    handlers={"Person": {"handler": handler}})
+        self.assertEqual(c.exception.args[0], "bad person")
+
+    def test_ensure_type_checks_each_value(self):
+        data = b'{"first_name": "shawn", "last_name": "adams"} 1'
+        with self.assertRaises(ValidationError):
+            collect(data, as_type="Person", ensure_type=self.Person)
+
+    def test_malformed_json_raises_JsonDecodeError(self):
+        with self.assertRaises(JsonDecodeError):
+            collect(b'{"foo": ')
+        with self.assertRaises(JsonDecodeError):
+            collect(b'[1, 2', items=True)
+        with self.assertRaises(JsonDecodeError):
+            collect(b'[1 2]', items=True)
+        with self.assertRaises(JsonDecodeError):
+            collect(b'{"foo": 1}', items=True)
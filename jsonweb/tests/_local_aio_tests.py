@@ -0,0 +1,39 @@
+import asyncio
+import unittest
+
+from jsonweb._local import ContextStack, ContextVar
+
+
+@unittest.skipIf(ContextVar is None, "contextvars is not available")
+class TestContextStackTasks(unittest.TestCase):
+    def setUp(self):
+        self.stack = ContextStack()
+
+    def test_each_task_has_own_stack(self):
+        stack = self.stack
+        stack.push("outer")
+
+        async def task(value, started, release):
+            stack.push(value)
+            started.set()
+            await release.wait()
+            return stack.pop(), stack.top
+
+        async def run():
+            started = [asyncio.Event(), asyncio.Event()]
+            release = asyncio.Event()
+            tasks = [asyncio.ensure_future(task(v, e, release))
+                     for v, e in zip("ab", started)]
+            for event in started:
+                await event.wait()
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+
+        self.assertEqual(results, [("a", "outer"), ("b", "outer")])
+        self.assertEqual(stack.top, "outer")
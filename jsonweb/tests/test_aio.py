@@ -0,0 +1,6 @@
+import sys
+
+# The tests use async generators, a syntax error before python 3.6, so
+# they are kept in a module only imported where they can run.
+if sys.version_info >= (3, 6):
+    from jsonweb.tests._aio_tests import *
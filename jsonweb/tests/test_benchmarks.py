@@ -0,0 +1,55 @@
+import os
+import tempfile
+import unittest
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+from jsonweb import benchmarks
+from jsonweb.benchmarks.__main__ import main
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        from jsonweb.decode import _default_object_handlers
+        _default_object_handlers.clear()
+
+    def test_run_every_benchmark_on_small_payloads(self):
+        results = benchmarks.run(r"\.small$", repeat=1, min_time=0)
+        names = set(results["results"])
+        self.assertEqual(
+            names, set(name + ".small" for name, (_, _, metric)
+                       in benchmarks._benchmarks.items()
+                       if metric == "seconds" or tracemalloc)
+        )
+        self.assertTrue(results["results"]["decode.loader.small"]["seconds"] > 0)
+        if tracemalloc:
+            self.assertTrue(
+                results["results"]["memory.loader.small"]["bytes"] > 0
+            )
+
+    def test_compare_flags_regressions(self):
+        baseline = {"results": {
+            "a": {"seconds": 1.0}, "b": {"seconds": 1.0},
+            "c": {"bytes": 100}, "gone": {"seconds": 1.0}
+        }}
+        current = {"results": {
+            "a": {"seconds": 1.05}, "b": {"seconds": 1.5},
+            "c": {"bytes": 200}, "new": {"seconds": 1.0}
+        }}
+        rows = benchmarks.compare(baseline, current, threshold=0.1)
+        regressed = dict((row[0], row[-1]) for row in rows)
+        self.assertEqual(regressed, {"a": False, "b": True, "c": True})
+
+    def test_command_line(self):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            self.assertEqual(main(["run", "-k", r"^validators\.List\.small$",
+                                   "--repeat", "1", "--min-time", "0",
+                                   "-o", path]), 0)
+            self.assertEqual(main(["compare", path, path]), 0)
+        finally:
+            os.remove(path)
@@ -1,11 +1,24 @@
 import json
+import multiprocessing
+import os
+import pickle
+import tempfile
 import unittest
 from jsonweb import from_object, loader, decode
-from jsonweb.decode import ObjectAttributeError, ObjectDecodeError, object_hook, JsonDecodeError
+from jsonweb.decode import ObjectAttributeError, ObjectDecodeError, object_hook, JsonDecodeError, \
+    DecodeLimitError
 from jsonweb.exceptions import JsonWebError
 from jsonweb.validators import ValidationError
 
 
+# Defined at module level so instances can be pickled back from the worker
+# processes used by ``parallel_load_lines``.
+class Point(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
 class TestJsonWebObjectDecoder(unittest.TestCase):
     def setUp(self):
         from jsonweb.decode import _default_object_handlers
@@ -356,3 +369,632 @@ class TestJsonWebObjectDecoder(unittest.TestCase):
             self.assertEqual(decode._as_type_context.top, Person)
 
         self.assertEqual(decode._as_type_context.top, None)        
+
+    def test_parallel_load_lines(self):
+        from_object()(Point)
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w") as f:
+            for i in range(100):
+                f.write('{{"__type__": "Point", "x": {0}, "y": 1}}\n'.format(i))
+                if i % 10 == 0:
+                    f.write("\n")
+        # Workers get the parent's handlers whether they fork or not.
+        if hasattr(multiprocessing, "get_all_start_methods"):
+            contexts = multiprocessing.get_all_start_methods()
+        else:
+            contexts = [None]
+        try:
+            for context in contexts:
+                points = list(decode.parallel_load_lines(path, workers=2,
+                                                         context=context))
+                self.assertEqual([p.x for p in points], list(range(100)))
+                self.assertTrue(all(isinstance(p, Point) for p in points))
+
+            points = decode.parallel_load_lines(path, workers=2, ordered=False)
+            self.assertEqual(sorted(p.x for p in points), list(range(100)))
+        finally:
+            os.remove(path)
+
+    def test_parallel_load_lines_raises_worker_errors(self):
+        fd, path = tempfile.mkstemp(suffix=".ndjson")
+        with os.fdopen(fd, "w") as f:
+            f.write('{"__type__": "Point", "x": 1, "y": 1}\n')
+        try:
+            with self.assertRaises(decode.ObjectNotFoundError) as context:
+                list(decode.parallel_load_lines(path, workers=1))
+            self.assertEqual(context.exception.extras["obj_type"], "Point")
+        finally:
+            os.remove(path)
+
+    def test_errors_can_be_pickled(self):
+        exc = pickle.loads(pickle.dumps(ObjectAttributeError("Person", "age")))
+        self.assertEqual(str(exc), "Missing age attribute for Person.")
+        self.assertEqual(exc.extras["attribute"], "age")
+
+    def test_loader_accepts_binary_input(self):
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        json_bytes = b'{"__type__": "Person", "first_name": "shawn", "last_name": "adams"}'
+        for data in (json_bytes, bytearray(json_bytes), memoryview(json_bytes),
+                     json_bytes.decode("utf-8").encode("utf-16")):
+            person = loader(data)
+            self.assertTrue(isinstance(person, Person))
+            self.assertEqual(person.first_name, "shawn")
+
+        with self.assertRaises(JsonDecodeError):
+            loader(b'{"foo": "\xff"}')
+
+    def test_load_file(self):
+        from_object()(Point)
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            f.write('[{"__type__": "Point", "x": 1, "y": 2}]')
+        try:
+            points = decode.load_file(path)
+            self.assertEqual(len(points), 1)
+            self.assertEqual((points[0].x, points[0].y), (1, 2))
+
+            with open(path, "wb") as f:
+                f.write(u'[{"__type__": "Point", "x": 3, "y": 4}]'.encode("utf-16"))
+            points = decode.load_file(path)
+            self.assertEqual((points[0].x, points[0].y), (3, 4))
+
+            with open(path, "w"):
+                pass
+            with self.assertRaises(JsonDecodeError):
+                decode.load_file(path)
+        finally:
+            os.remove(path)
+
+    def test_lazy_decode_defers_construction(self):
+        created = []
+
+        @from_object()
+        class Job(object):
+            def __init__(self, title):
+                created.append(title)
+                self.title = title
+
+        @from_object()
+        class Person(object):
+            def __init__(self, name, job):
+                created.append(name)
+                self.name = name
+                self.job = job
+
+        json_str = ('{"__type__": "Person", "name": "shawn", '
+                    '"job": {"__type__": "Job", "title": "jedi"}}')
+        person = loader(json_str, lazy=True, ensure_type=Person)
+        self.assertEqual(created, [])
+        self.assertTrue(isinstance(person, Person))
+        self.assertTrue(type(person) is decode.LazyObject)
+
+        self.assertEqual(person.name, "shawn")
+        self.assertEqual(created, ["shawn"])
+        self.assertEqual(person.job.title, "jedi")
+        self.assertEqual(created, ["shawn", "jedi"])
+
+        person.name = "luke"
+        self.assertEqual(decode.resolve(person).name, "luke")
+        self.assertTrue(type(decode.resolve(person)) is Person)
+
+    def test_lazy_decode_raises_on_first_use(self):
+
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        person = loader('{"__type__": "Person", "first_name": "shawn"}',
+                        lazy=True)
+        with self.assertRaises(ObjectAttributeError):
+            person.first_name
+
+        with self.assertRaises(decode.ObjectNotFoundError):
+            loader('{"__type__": "Jedi"}', lazy=True)
+
+    def test_intern_keys_and_values(self):
+        json_str = ('[{"status": "active", "name": "bob"}, '
+                    '{"status": "active", "name": "bob"}]')
+
+        a, b = loader(json_str)
+        self.assertFalse(a["status"] is b["status"])
+
+        a, b = loader(json_str, intern_keys=True, intern_values={"active"})
+        self.assertTrue(a["status"] is b["status"])
+        self.assertFalse(a["name"] is b["name"])
+        key_a = [k for k in a if k == "status"][0]
+        key_b = [k for k in b if k == "status"][0]
+        self.assertTrue(key_a is key_b)
+
+        a, b = loader(json_str, intern_values=lambda v: len(v) < 5)
+        self.assertTrue(a["name"] is b["name"])
+        self.assertFalse(a["status"] is b["status"])
+
+        a, b = loader(json_str, intern_values=lambda v: True, intern_limit=1)
+        self.assertTrue(a["status"] is b["status"])
+        self.assertFalse(a["name"] is b["name"])
+
+    @unittest.skipIf(not decode._SCANNER_SHARES_KEYS,
+                     "the json scanner does not share keys")
+    def test_intern_keys_is_free_when_json_shares_keys(self):
+        json_str = '[{"status": 1}, {"status": 2}]'
+        table = decode._InternTable
+        decode._InternTable = None
+        try:
+            a, b = loader(json_str, intern_keys=True)
+        finally:
+            decode._InternTable = table
+        self.assertTrue(list(a)[0] is list(b)[0])
+
+    def test_intern_values_still_decodes_objects(self):
+
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        persons = loader('[{"first_name": "shawn", "last_name": "adams"}]',
+                         as_type="Person", intern_keys=True,
+                         intern_values={"adams"})
+        self.assertTrue(isinstance(persons[0], Person))
+        self.assertEqual(persons[0].last_name, "adams")
+
+    def test_select_decodes_only_the_selected_subtree(self):
+
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        json_str = '''{
+            "meta": {"__type__": "NoSuchType"},
+            "payload": {"a/b": [
+                {"first_name": "shawn", "last_name": "adams"},
+                {"__type__": "Person", "first_name": "luke",
+                 "last_name": "skywalker"}
+            ]}
+        }'''
+        persons = loader(json_str, select="/payload/a~1b", as_type="Person")
+        self.assertEqual(len(persons), 2)
+        self.assertTrue(all(isinstance(p, Person) for p in persons))
+
+        person = loader(json_str, select="/payload/a~1b/1")
+        self.assertEqual(person.first_name, "luke")
+
+        person = loader(json_str, select="/payload/a~1b/1", intern_keys=True)
+        self.assertTrue(isinstance(person, Person))
+
+        with self.assertRaises(decode.ObjectNotFoundError):
+            loader(json_str, select="")
+
+        for pointer in ("/payload/nope", "/payload/a~1b/5", "/payload/a~1b/x",
+                        "/payload/a~1b/-1", "/payload/a~1b/01",
+                        "/payload/a~1b/+1", "/payload/a~1b/1\n", "payload"):
+            with self.assertRaises(JsonDecodeError) as context:
+                loader(json_str, select=pointer)
+            self.assertEqual(context.exception.extras["pointer"], pointer)
+
+    def test_resource_limits(self):
+
+        @from_object()
+        class Person(object):
+            def __init__(self, name):
+                self.name = name
+
+        def limit_hit(json_str, **kw):
+            with self.assertRaises(DecodeLimitError) as context:
+                loader(json_str, **kw)
+            return context.exception.extras["limit"]
+
+        json_str = '{"a": [1, 2, [3, "[[[,,,"]], "b": {"c": {}}}'
+        self.assertEqual(loader(json_str, max_size=len(json_str), max_depth=3,
+                                max_items=3, max_keys=2)["b"], {"c": {}})
+
+        self.assertEqual(limit_hit(json_str, max_size=10), "max_size")
+        self.assertEqual(limit_hit(json_str.encode("utf-8"), max_size=10),
+                         "max_size")
+        self.assertEqual(limit_hit(json_str, max_depth=2), "max_depth")
+        self.assertEqual(limit_hit(json_str, max_items=2), "max_items")
+        self.assertEqual(limit_hit(json_str, max_keys=1), "max_keys")
+        # Objects outside of the selected value count too.
+        json_str = '{"junk": {"a": 1, "b": 2, "c": 3}, "x": []}'
+        self.assertEqual(limit_hit(json_str, select="/x", max_keys=2),
+                         "max_keys")
+        self.assertEqual(limit_hit(json_str, id_key="id", max_keys=2),
+                         "max_keys")
+        self.assertEqual(loader(json_str, select="/x", max_keys=3), [])
+        json_str = '{"a": [1, 2, [3, "[[[,,,"]], "b": {"c": {}}}'
+        self.assertEqual(limit_hit("[" * 100000, max_depth=50), "max_depth")
+        with self.assertRaises(DecodeLimitError) as context:
+            loader('{"a": "[[[", "b": [[[1]]]}', max_depth=3)
+        self.assertEqual(context.exception.extras["position"], 20)
+        with self.assertRaises(DecodeLimitError) as context:
+            loader('[1, "a,b", [1, 2, 3]]', max_items=2)
+        self.assertEqual(context.exception.extras["position"], 9)
+
+        people = '[{"name": "a"}, {"name": "b"}, {"name": "c"}]'
+        self.assertEqual(len(loader(people, as_type="Person", max_objects=3)), 3)
+        self.assertEqual(
+            limit_hit(people, as_type="Person", max_objects=2), "max_objects"
+        )
+
+        hook = object_hook(max_keys=1)
+        with self.assertRaises(DecodeLimitError):
+            json.loads('{"a": 1, "b": 2}', object_hook=hook)
+        self.assertTrue(issubclass(DecodeLimitError, JsonDecodeError))
+
+    def test_handler_overlay(self):
+        from jsonweb.decode import _default_object_handlers
+
+        @from_object()
+        class Person(object):
+            def __init__(self, first_name, last_name):
+                self.first_name = first_name
+                self.last_name = last_name
+
+        def person_decoder(cls, obj):
+            return "decoded"
+
+        overlay = _default_object_handlers.overlay()
+        self.assertTrue("Person" in overlay)
+        self.assertEqual(overlay["Person"][1], Person)
+
+        overlay.update_handler("Person", handler=person_decoder)
+        self.assertEqual(overlay["Person"][0], person_decoder)
+        self.assertNotEqual(_default_object_handlers["Person"][0],
+                            person_decoder)
+
+        overlay.add_handler(Point, person_decoder)
+        self.assertTrue("Point" in overlay)
+        self.assertFalse("Point" in _default_object_handlers)
+        self.assertEqual(sorted(n for n, t in overlay), ["Person", "Point"])
+        self.assertEqual(overlay.get("Jedi"), None)
+        with self.assertRaises(KeyError):
+            overlay["Jedi"]
+
+    def test_supplied_handlers_dict_can_be_reused(self):
+        def point_decoder(cls, obj):
+            return cls(obj["x"], obj["y"])
+
+        handlers = {"Point": {"cls": Point, "handler": point_decoder}}
+        json_str = '{"__type__": "Point", "x": 1, "y": 2}'
+        for _ in range(2):
+            self.assertTrue(isinstance(loader(json_str, handlers=handlers),
+                                       Point))
+        self.assertFalse("Point" in decode._default_object_handlers)
+
+    def test_decode_stats(self):
+        from jsonweb.schema import ObjectSchema
+        from jsonweb.validators import String
+
+        class PersonSchema(ObjectSchema):
+            first_name = String()
+
+        @from_object(schema=PersonSchema)
+        class Person(object):
+            def __init__(self, first_name, last_name=None):
+                self.first_name = first_name
+
+        stats = decode.DecodeStats()
+        loader('[{"__type__": "Person", "first_name": "shawn"}, '
+               '{"__type__": "Person", "first_name": "luke"}]', stats=stats)
+        with self.assertRaises(ValidationError):
+            loader('{"__type__": "Person", "first_name": 1}', stats=stats)
+
+        person = stats.snapshot()["Person"]
+        self.assertEqual(person["count"], 2)
+        self.assertTrue(person["validate_time"] > 0)
+        self.assertTrue(person["construct_time"] > 0)
+        self.assertEqual(person["failures"], {"ValidationError": 1})
+
+        stats.reset()
+        self.assertEqual(stats.snapshot(), {})
+
+        loader('{"__type__": "Person", "first_name": "shawn"}')
+        self.assertEqual(decode.decode_stats.snapshot(), {})
+        decode.decode_stats.enable()
+        try:
+            loader('{"__type__": "Person", "first_name": "shawn"}')
+        finally:
+            decode.decode_stats.disable()
+        self.assertEqual(decode.decode_stats.snapshot()["Person"]["count"], 1)
+        decode.decode_stats.reset()
+
+    def test_references_decode_to_shared_instances(self):
+
+        @from_object()
+        class Job(object):
+            def __init__(self, id, title):
+                self.id = id
+                self.title = title
+
+        @from_object()
+        class Person(object):
+            def __init__(self, name, job):
+                self.name = name
+                self.job = job
+
+        json_str = '''{"people": [
+            {"__type__": "Person", "name": "shawn", "job": {"$ref": 1}},
+            {"__type__": "Person", "name": "luke",
+             "job": {"__type__": "Job", "id": 1, "title": "jedi"}},
+            {"__type__": "Person", "name": "leia", "job": {"$ref": 1}}
+        ], "jobs": [{"$ref": 1}]}'''
+        doc = loader(json_str, id_key="id")
+        shawn, luke, leia = doc["people"]
+        self.assertTrue(isinstance(shawn.job, Job))
+        self.assertTrue(shawn.job is luke.job)
+        self.assertTrue(leia.job is luke.job)
+        self.assertTrue(doc["jobs"][0] is luke.job)
+
+        people = loader(json_str, id_key="id", select="/people")
+        self.assertTrue(people[0].job is people[2].job)
+
+        json_str = '[{"__type__": "Job", "key": "a", "title": "jedi"}, {"@": "a"}]'
+        jobs = loader(json_str, id_key="key", ref_key="@",
+                      handlers={"Job": {"handler": lambda cls, obj: obj}})
+        self.assertTrue(jobs[0] is jobs[1])
+
+    def test_bad_references_raise_errors(self):
+        with self.assertRaises(decode.ObjectReferenceError) as context:
+            loader('[{"id": 1}, {"$ref": 2}]', id_key="id")
+        self.assertEqual(context.exception.extras["ref"], 2)
+
+        with self.assertRaises(decode.ObjectReferenceError):
+            loader('{"id": 1, "self": {"$ref": 1}}', id_key="id")
+
+        with self.assertRaises(decode.ObjectReferenceError) as context:
+            loader('{"id": [1]}', id_key="id")
+        self.assertEqual(context.exception.extras["ref"], [1])
+
+        with self.assertRaises(decode.ObjectReferenceError):
+            loader('[{"__type__": "A", "id": 1}, {"__type__": "B", "id": 1},'
+                   ' {"$ref": 1}]', id_key="id",
+                   handlers={"A": {"cls": dict, "type_name": "A",
+                                   "handler": lambda cls, obj: obj},
+                             "B": {"cls": dict, "type_name": "B",
+                                   "handler": lambda cls, obj: obj}})
+
+        # Errors constructing the target are not mistaken for a bad ref.
+        def fail(cls, obj):
+            raise TypeError("boom")
+
+        with self.assertRaises(TypeError):
+            loader('[{"$ref": 7}, {"__type__": "A", "id": 7}]', id_key="id",
+                   handlers={"A": {"cls": dict, "type_name": "A",
+                                   "handler": fail}})
+
+    def test_reference_ids_are_unique_per_type(self):
+        handlers = {
+            "User": {"cls": dict, "type_name": "User",
+                     "handler": lambda cls, obj: ("User", obj)},
+            "Tag": {"cls": dict, "type_name": "Tag",
+                    "handler": lambda cls, obj: ("Tag", obj)}
+        }
+        user = loader('{"__type__": "User", "id": 1, '
+                      '"tag": {"__type__": "Tag", "id": 1}}',
+                      id_key="id", handlers=handlers)
+        self.assertEqual(user[0], "User")
+        self.assertEqual(user[1]["tag"][0], "Tag")
+
+        doc = loader('[{"__type__": "User", "id": 1},'
+                     ' {"__type__": "Tag", "id": 1},'
+                     ' {"__type__": "Tag", "$ref": 1},'
+                     ' {"__type__": "User", "$ref": 1}]',
+                     id_key="id", handlers=handlers)
+        self.assertTrue(doc[2] is doc[1])
+        self.assertTrue(doc[3] is doc[0])
+
+    def test_trusted_construct_skips__init__(self):
+        calls = []
+
+        @from_object(trusted_construct=True)
+        class Person(object):
+            def __init__(self, first_name, last_name, job=None):
+                calls.append(first_name)
+                self.first_name = first_name
+                self.last_name = last_name
+                self.job = job
+
+        json_str = ('{"__type__": "Person", "first_name": "shawn", '
+                    '"last_name": "adams", "extra": 1}')
+        # The first instance goes through __init__ to check what it does.
+        loader(json_str)
+        self.assertEqual(calls, ["shawn"])
+        person = loader(json_str)
+        self.assertTrue(isinstance(person, Person))
+        self.assertEqual(calls, ["shawn"])
+        self.assertEqual(vars(person), {"first_name": "shawn",
+                                        "last_name": "adams", "job": None})
+
+        with self.assertRaises(ObjectAttributeError):
+            loader('{"__type__": "Person", "first_name": "shawn"}')
+        # As many keys as needed, but not the right ones.
+        with self.assertRaises(ObjectAttributeError):
+            loader('{"__type__": "Person", "first_name": "shawn", '
+                   '"job": "dev", "extra": 1}')
+
+        with self.assertRaises(JsonWebError):
+            from_object(lambda cls, obj: obj, trusted_construct=True)
+
+    def test_trusted_construct_finds_instance_dicts(self):
+        class Slotted(object):
+            __slots__ = ("x",)
+
+            def __new__(cls):
+                raise AssertionError("not while planning")
+
+        class Plain(object):
+            pass
+
+        class SlottedPlain(Plain):
+            __slots__ = ("x",)
+
+        class SlottedDict(object):
+            __slots__ = ("x", "__dict__")
+
+        from jsonweb.decode import _has_instance_dict
+        self.assertFalse(_has_instance_dict(Slotted))
+        self.assertTrue(_has_instance_dict(Plain))
+        self.assertTrue(_has_instance_dict(SlottedPlain))
+        self.assertTrue(_has_instance_dict(SlottedDict))
+
+    def test_trusted_construct_keeps__init__that_does_more(self):
+        calls = []
+
+        @from_object(trusted_construct=True)
+        class Renamed(object):
+            def __init__(self, name):
+                calls.append(name)
+                self._name = name.upper()
+
+        @from_object(trusted_construct=True)
+        class Slotted(object):
+            __slots__ = ("name", "size")
+
+            def __init__(self, name):
+                self.name = name
+                self.size = len(name)
+
+        for i in range(2):
+            obj = loader('{"__type__": "Renamed", "name": "x"}')
+            self.assertEqual(vars(obj), {"_name": "X"})
+            obj = loader('{"__type__": "Slotted", "name": "abc"}')
+            self.assertEqual((obj.name, obj.size), ("abc", 3))
+        self.assertEqual(calls, ["x", "x"])
+
+    def test_trusted_kw_argument(self):
+        calls = []
+
+        @from_object()
+        class Person(object):
+            __slots__ = ("first_name", "last_name")
+
+            def __init__(self, first_name, last_name):
+                calls.append(first_name)
+                self.first_name = first_name
+                self.last_name = last_name
+
+        json_str = '{"__type__": "Person", "first_name": "shawn", "last_name": "adams"}'
+        loader(json_str, trusted=True)
+        person = loader(json_str, trusted=True)
+        self.assertEqual(calls, ["shawn"])
+        self.assertEqual((person.first_name, person.last_name),
+                         ("shawn", "adams"))
+
+        loader(json_str)
+        self.assertEqual(calls, ["shawn", "shawn"])
+
+    def test_batch_decode_matches_per_object_decode(self):
+        from jsonweb.schema import ObjectSchema
+        from jsonweb.validators import String, Integer, List, EnsureType
+        from jsonweb.decode import decode_many
+
+        class JobSchema(ObjectSchema):
+            title = String()
+
+        class PersonSchema(ObjectSchema):
+            name = String()
+            age = Integer()
+            jobs = List(EnsureType("Job"), optional=True)
+
+        @from_object(schema=JobSchema)
+        class Job(object):
+            def __init__(self, title):
+                self.title = title
+
+        @from_object(schema=PersonSchema)
+        class Person(object):
+            def __init__(self, name, age, jobs=None):
+                self.name = name
+                self.age = age
+                self.jobs = jobs
+
+        def dump(people):
+            return [(p.__class__.__name__, vars(p).get("name"),
+                     vars(p).get("age"),
+                     [j.title for j in p.jobs or []]) for p in people]
+
+        json_str = json.dumps([
+            {"name": "shawn", "age": 30,
+             "jobs": [{"__type__": "Job", "title": "dev"}]},
+            {"name": "bob", "age": 40},
+            {"__type__": "Job", "title": "boss"},
+        ])
+        expected = loader(json_str, as_type="Person")
+        people = loader(json_str, as_type="Person", batch=True)
+        self.assertEqual(len(people), 3)
+        self.assertIsInstance(people[2], Job)
+        self.assertEqual(dump(people[:2]), dump(expected[:2]))
+        self.assertEqual(people[2].title, "boss")
+
+        people = decode_many(json.loads(json_str), "Person")
+        self.assertEqual(dump(people[:2]), dump(expected[:2]))
+
+        bad = '[{"name": "shawn", "age": "thirty"}]'
+        with self.assertRaises(ValidationError) as per_object:
+            loader(bad, as_type="Person")
+        with self.assertRaises(ValidationError) as batched:
+            loader(bad, as_type="Person", batch=True)
+        from jsonweb.encode import dumper
+        self.assertEqual(dumper(batched.exception),
+                         dumper(per_object.exception))
+
+        # Items that are not objects do not hide objects nested elsewhere.
+        for json_str in [
+            '[null, {"name": "a", "age": 1, '
+            '"jobs": [{"__type__": "Job", "title": "x"}]}]',
+            '[[{"__type__": "Job", "title": "x"}], 5]',
+        ]:
+            expected = loader(json_str, as_type="Person")
+            people = loader(json_str, as_type="Person", batch=True)
+            self.assertEqual([p.__class__ for p in people],
+                             [p.__class__ for p in expected])
+        self.assertIsInstance(people[0][0], Job)
+        people = loader('[null, {"name": "a", "age": 1, '
+                        '"jobs": [{"__type__": "Job", "title": "x"}]}]',
+                        as_type="Person", batch=True)
+        self.assertIsInstance(people[1].jobs[0], Job)
+
+        with self.assertRaises(decode.ObjectNotFoundError):
+            decode_many([{}], "Nobody")
+
+    def test_batch_decode_edge_cases(self):
+        from jsonweb.decode import decode_many
+
+        @from_object()
+        class Empty(object):
+            def __init__(self, v):
+                self.v = v
+
+            def __len__(self):
+                return 0
+
+        @from_object()
+        class Point(object):
+            def __init__(self, a, b=None):
+                self.a = a
+                self.b = b
+
+        json_str = '[{"__type__": "Empty", "v": 1}, {"a": 2}]'
+        for batch in (False, True):
+            objs = loader(json_str, as_type="Point", batch=batch)
+            self.assertEqual([o.__class__ for o in objs], [Empty, Point])
+
+        json_str = '[{"a": 1, "b": 2, "c": 3}]'
+        for batch in (False, True):
+            with self.assertRaises(decode.DecodeLimitError):
+                loader(json_str, as_type="Point", max_keys=2, batch=batch)
+        with self.assertRaises(decode.DecodeLimitError):
+            decode_many(json.loads(json_str), "Point", max_keys=2)
+
+        point = decode_many([{"a": 1, "b": {"a": 2}}], "Point")[0]
+        self.assertIsInstance(point.b, Point)
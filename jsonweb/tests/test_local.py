@@ -1,7 +1,7 @@
 from threading import Thread
 import unittest
 
-from jsonweb._local import LocalStack
+from jsonweb._local import LocalStack, ContextStack, ContextVar
 
 stack = LocalStack()
 
@@ -39,4 +39,35 @@ class TestLocalStack(unittest.TestCase):
         
         
         
-        
\ No newline at end of file
+
+
+@unittest.skipIf(ContextVar is None, "contextvars is not available")
+class TestContextStack(unittest.TestCase):
+    def setUp(self):
+        self.stack = ContextStack()
+
+    def test_push_pop_and_top(self):
+        self.assertEqual(self.stack.top, None)
+        self.assertEqual(self.stack.pop(), None)
+        self.stack.push(66)
+        self.stack.push(166)
+        self.assertEqual(self.stack.top, 166)
+        self.assertEqual(self.stack.pop(), 166)
+        self.assertEqual(self.stack.pop(), 66)
+        self.assertEqual(self.stack.top, None)
+
+    def test_each_thread_has_own_stack(self):
+        self.stack.push(42)
+        seen = []
+
+        def run():
+            seen.append(self.stack.top)
+            self.stack.push(10)
+            seen.append(self.stack.top)
+
+        t = Thread(target=run)
+        t.start()
+        t.join()
+
+        self.assertEqual(seen, [None, 10])
+        self.assertEqual(self.stack.top, 42)
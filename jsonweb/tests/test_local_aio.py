@@ -0,0 +1,5 @@
+import sys
+
+# See test_aio.py.
+if sys.version_info >= (3, 6):
+    from jsonweb.tests._local_aio_tests import *
@@ -31,3 +31,11 @@ class TestPy3k(unittest.TestCase):
             self.assertEqual(type(items({})), type({}.items()))
         if major_version() == 2:
             self.assertEqual(type(items({})), type({}.iteritems()))
+
+    def test_keys(self):
+        from jsonweb.py3k import keys
+
+        if major_version() == 3:
+            self.assertEqual(type(keys({})), type({}.keys()))
+        if major_version() == 2:
+            self.assertEqual(type(keys({})), type({}.viewkeys()))
@@ -1,5 +1,6 @@
 import unittest
-from jsonweb import from_object
+from jsonweb import from_object, loader, dumper
+from jsonweb.py3k import PY3k
 from jsonweb.schema import ObjectSchema, SchemaMeta
 from jsonweb.validators import String, Float, Integer, ValidationError, List, \
     EnsureType
@@ -207,6 +208,10 @@ class TestSchema(unittest.TestCase):
         )
         self.assertEqual(person.get("species"), "Human")
 
+    def test_validation_error_is_importable_from_schema(self):
+        from jsonweb import schema, validators
+        self.assertIs(schema.ValidationError, validators.ValidationError)
+
     def test_create(self):
         schema_cls = ObjectSchema.create("MySchema", {
             "first-name": String(),
@@ -256,3 +261,285 @@ class TestSchema(unittest.TestCase):
         exc = c.exception
         self.assertIn("foo", exc.errors)
         self.assertIn("bar", exc.errors)
+
+    def test_field_specs(self):
+        class BaseSchema(ObjectSchema):
+            foo = String()
+            bar = Integer()
+
+        bar = Integer(optional=True, nullable=True)
+        job = EnsureType("DefinedLater", default=1)
+
+        class BarSchema(BaseSchema):
+            locals().update(bar=bar, job=job)
+
+        self.assertEqual(sorted(BarSchema._fields), ["bar", "foo", "job"])
+        self.assertEqual(len(BarSchema._fields), 3)
+        specs = dict((spec[0], spec) for spec in BarSchema._field_specs)
+        self.assertEqual(specs["bar"], ("bar", bar, False, None, True))
+        self.assertEqual(specs["job"], ("job", job, True, 1, False))
+
+        @from_object()
+        class DefinedLater(object):
+            def __init__(self, name):
+                self.name = name
+
+        self.assertEqual(BarSchema().validate({"foo": "x", "bar": None}),
+                         {"foo": "x", "bar": None, "job": 1})
+
+        # Assigning a validator rebuilds the class and its subclasses.
+        BaseSchema.foo = Integer()
+        self.assertIsNone(BarSchema._compiled_collect)
+        self.assertEqual(BarSchema().validate({"foo": 1}),
+                         {"foo": 1, "job": 1})
+        del BarSchema.job
+        self.assertEqual(sorted(BarSchema._fields), ["bar", "foo"])
+        self.assertEqual(BarSchema().validate({"foo": 1}), {"foo": 1})
+
+    def test_record_class(self):
+        from jsonweb.decode import _default_object_handlers
+        _default_object_handlers.clear()
+
+        class PersonSchema(ObjectSchema):
+            first_name = String()
+            last_name = String(optional=True)
+            age = Integer(default=30)
+
+        Person = PersonSchema.record_class("Person")
+        person = loader('{"__type__": "Person", "first_name": "shawn"}')
+
+        self.assertTrue(isinstance(person, Person))
+        self.assertFalse(hasattr(person, "__dict__"))
+        self.assertEqual(person.first_name, "shawn")
+        self.assertEqual(person.last_name, None)
+        self.assertEqual(person.age, 30)
+        values = {"first_name": "shawn", "last_name": None, "age": 30}
+        self.assertEqual(person, Person(*[values[f] for f in Person._fields]))
+        self.assertEqual(loader(dumper(person, exclude_nulls=True)), person)
+
+        with self.assertRaises(ValidationError):
+            loader('{"__type__": "Person"}')
+
+        PersonTuple = PersonSchema.record_class("PersonTuple", as_tuple=True)
+        person = loader('{"first_name": "shawn", "last_name": "adams"}',
+                        as_type="PersonTuple")
+        self.assertTrue(isinstance(person, PersonTuple))
+        self.assertEqual(person.last_name, "adams")
+
+    def test_record_class_needs_attribute_names(self):
+        from jsonweb.exceptions import JsonWebError
+
+        for name in ("first-name", "_private", "class", "1st"):
+            PersonSchema = ObjectSchema.create("PersonSchema",
+                                               {name: String()})
+            for as_tuple in (False, True):
+                with self.assertRaises(JsonWebError) as c:
+                    PersonSchema.record_class("Person", as_tuple,
+                                              register=False)
+                self.assertTrue(repr(name) in str(c.exception))
+
+    @unittest.skipIf(not PY3k, "tracemalloc needs python 3")
+    def test_record_class_uses_less_memory_than_dicts(self):
+        import tracemalloc
+
+        class PointSchema(ObjectSchema):
+            x = Integer()
+            y = Integer()
+            z = Integer()
+
+        Point = PointSchema.record_class("Point", register=False)
+
+        def measure(factory):
+            tracemalloc.start()
+            objs = [factory() for _ in range(1000)]
+            size = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            return size
+
+        self.assertLess(measure(lambda: Point(1, 2, 3)) * 2,
+                        measure(lambda: {"x": 1, "y": 2, "z": 3}))
+
+    def test_compiled_validate_matches_calling_each_validator(self):
+        from jsonweb.validators import Boolean, Number, Regex, _Errors, \
+            isinstance_or_raise
+        from jsonweb.decode import _default_object_handlers
+        _default_object_handlers.clear()
+
+        @from_object()
+        class Job(object):
+            def __init__(self, title=None):
+                self.title = title
+
+        class BaseSchema(ObjectSchema):
+            flag = Boolean(nullable=True)
+
+        class ThingSchema(BaseSchema):
+            name = String(min_len=2, max_len=5)
+            code = Regex(r"^[a-z]+$", optional=True)
+            count = Integer(default=7)
+            ratio = Float(optional=True)
+            total = Number()
+            tags = List(String(), optional=True)
+            job = EnsureType("Job", optional=True)
+
+        ThingSchema = ObjectSchema.create("ThingSchema", dict(
+            vars(ThingSchema), **{"dashed-key": String(optional=True)}
+        ))
+
+        def reference(schema, obj):
+            # What ObjectSchema._validate did before being compiled.
+            isinstance_or_raise(obj, dict)
+            val_obj = {}
+            errors = _Errors({})
+            for field in schema._fields:
+                v = getattr(schema, field)
+                try:
+                    if field not in obj:
+                        if v.default is not None:
+                            val_obj[field] = v.default
+                        elif v.required:
+                            errors.add_error(
+                                "Missing required parameter.", key=field,
+                                error_type="required_but_missing"
+                            )
+                    else:
+                        val_obj[field] = v.validate(obj[field])
+                except ValidationError as e:
+                    errors.add_error(e, key=field)
+            errors.raise_if_errors("Error validating object.",
+                                   error_type="invalid_object")
+            return val_obj
+
+        def outcome(func, obj):
+            try:
+                return func(obj)
+            except ValidationError as e:
+                return dumper(e, sort_keys=True)
+
+        schema = ThingSchema()
+        for obj in [
+            {"name": "bob", "total": 1.5, "flag": None, "job": Job("dev")},
+            {"name": "bob", "total": 1, "count": 2, "ratio": 0.5,
+             "tags": ["a"], "code": "abc", "dashed-key": "x"},
+            {},
+            {"name": "b", "total": "1", "flag": 1, "code": "ABC"},
+            {"name": "toolongname", "total": None, "count": True,
+             "ratio": 1, "tags": [1], "job": 1, "dashed-key": 2},
+            {"name": None, "total": True, "count": None},
+            [],
+        ]:
+            self.assertEqual(outcome(schema.validate, obj),
+                             outcome(lambda o: reference(schema, o), obj))
+
+        # The subclass got its own function, the base still works.
+        self.assertIsNot(ThingSchema._compiled_collect, None)
+        self.assertIs(BaseSchema._compiled_collect, None)
+        self.assertEqual(BaseSchema().validate({"flag": True}),
+                         {"flag": True})
+
+    def test_fail_fast(self):
+        class PersonSchema(ObjectSchema):
+            first_name = String()
+            last_name = String()
+            age = Integer()
+
+        with self.assertRaises(ValidationError) as c:
+            PersonSchema().validate({"age": "x"}, fail_fast=True)
+        errors = list(c.exception.errors)
+        self.assertEqual(1, len(errors))
+        self.assertTrue(errors[0] in ("first_name", "last_name", "age"))
+
+        with self.assertRaises(ValidationError) as c:
+            PersonSchema().validate({"age": "x"}, max_errors=2)
+        self.assertEqual(2, len(c.exception.errors))
+
+        @from_object(schema=PersonSchema)
+        class Person(object):
+            def __init__(self, first_name, last_name, age):
+                pass
+
+        json_str = '{"__type__": "Person", "age": "x"}'
+        with self.assertRaises(ValidationError) as c:
+            loader(json_str, fail_fast=True)
+        self.assertEqual(1, len(c.exception.errors))
+        with self.assertRaises(ValidationError) as c:
+            loader(json_str)
+        self.assertEqual(3, len(c.exception.errors))
+
+    def test_nested_errors_keep_their_shape(self):
+        import json
+        from jsonweb.validators import BaseValidator, Dict
+
+        # A third party validator that only knows how to raise.
+        class Even(BaseValidator):
+            def _validate(self, item):
+                if not isinstance(item, int) or item % 2:
+                    self.raise_error("Not even: {0}", item)
+                return item
+
+        class TagSchema(ObjectSchema):
+            name = String(max_len=3)
+            weight = Even(optional=True)
+
+        class PostSchema(ObjectSchema):
+            title = String()
+            tags = List(TagSchema())
+            counts = Dict(Even(), key_validator=String(max_len=2))
+            matrix = List(List(Integer()))
+
+        obj = {"tags": [{"name": "ok"}, {"name": "long", "weight": 3}, 5],
+               "counts": {"a": 2, "b": 3, "long": 4},
+               "matrix": [[1], [1, "x"], None]}
+        with self.assertRaises(ValidationError) as c:
+            PostSchema().validate(obj)
+
+        self.assertEqual(json.loads(dumper(c.exception)), {
+            "reason": "Error validating object.",
+            "error_type": "invalid_object",
+            "errors": {
+                "title": {"reason": "Missing required parameter.",
+                          "error_type": "required_but_missing"},
+                "tags": {
+                    "reason": "Error validating list.",
+                    "reason_code": "invalid_list",
+                    "errors": [
+                        {"reason": "Error validating object.",
+                         "reason_code": "invalid_list_item", "index": 1,
+                         "error_type": "invalid_object",
+                         "errors": {
+                             "name": {
+                                 "reason": "String exceeds max length of 3.",
+                                 "reason_code": "invalid_str"
+                             },
+                             "weight": {"reason": "Not even: 3"}
+                         }},
+                        {"reason": "Expected dict got int instead.",
+                         "reason_code": "invalid_list_item", "index": 2},
+                    ]
+                },
+                "counts": {
+                    "reason": "Error validating dict.",
+                    "reason_code": "invalid_dict",
+                    "errors": {
+                        "b": {"reason": "Not even: 3",
+                              "reason_code": "invalid_dict_value"},
+                        "long": {"reason": "String exceeds max length of 2.",
+                                 "reason_code": "invalid_dict_key"}
+                    }
+                },
+                "matrix": {
+                    "reason": "Error validating list.",
+                    "reason_code": "invalid_list",
+                    "errors": [
+                        {"reason": "Error validating list.",
+                         "reason_code": "invalid_list_item", "index": 1,
+                         "errors": [
+                             {"reason": "Expected int got str instead.",
+                              "reason_code": "invalid_list_item", "index": 1}
+                         ]},
+                        {"reason": "Cannot be null.",
+                         "reason_code": "invalid_list_item", "index": 2},
+                    ]
+                },
+            }
+        })
@@ -105,6 +105,54 @@ class TestEachValidator(unittest.TestCase):
                          "'[a-z]{2}_[A-Z]{2}'.", str(exc.errors["en-US"]))
         self.assertEqual("invalid_dict_key", exc.errors["en-US"].reason_code)
 
+    def test_dict_remembers_valid_keys(self):
+        checked = []
+
+        class Locale(Regex):
+            def _validate(self, item):
+                checked.append(item)
+                return super(Locale, self)._validate(item)
+
+        v = Dict(Number, key_validator=Locale("^[a-z]{2}_[A-Z]{2}$"),
+                 key_cache_size=2)
+        self.assertEqual(v.validate({"en_US": 1, "fr_FR": 2}),
+                         {"en_US": 1, "fr_FR": 2})
+        self.assertEqual(v.validate({"en_US": 3, "fr_FR": 4}),
+                         {"en_US": 3, "fr_FR": 4})
+        self.assertEqual(sorted(checked), ["en_US", "fr_FR"])
+
+        # Invalid keys are never remembered.
+        for i in range(2):
+            with self.assertRaises(ValidationError) as c:
+                v.validate({"en_US": 1, "en-US": 1})
+            self.assertEqual(["en-US"], list(c.exception.errors))
+        self.assertEqual(checked.count("en-US"), 2)
+
+        # The oldest key is dropped once the cache is full.
+        del checked[:]
+        v.validate({"de_DE": 1})
+        v.validate({"en_US": 1, "de_DE": 1})
+        self.assertEqual(checked, ["de_DE", "en_US"])
+
+        del checked[:]
+        v = Dict(Number, key_validator=Locale("^[a-z]{2}_[A-Z]{2}$"),
+                 key_cache_size=0)
+        v.validate({"en_US": 1})
+        v.validate({"en_US": 1})
+        self.assertEqual(checked, ["en_US", "en_US"])
+
+    def test_dict_checks_string_keys_in_bulk(self):
+        v = Dict(Number)
+        self.assertEqual(v.validate({"a": 1, "b": 2}), {"a": 1, "b": 2})
+        with self.assertRaises(ValidationError) as c:
+            v.validate({"a": 1, 2: 2})
+        self.assertEqual("invalid_dict_key", c.exception.errors[2].reason_code)
+
+        v = Dict(Number, key_validator=String(max_len=1))
+        with self.assertRaises(ValidationError) as c:
+            v.validate({"a": 1, "bb": 2})
+        self.assertEqual(["bb"], list(c.exception.errors))
+
     def test_list_validator(self):
         v = List(Number)
         self.assertEqual([1, 2, 3], v.validate([1, 2, 3]))
@@ -124,6 +172,81 @@ class TestEachValidator(unittest.TestCase):
         self.assertEqual("invalid_list_item", exc.errors[0].reason_code)
         self.assertEqual("Expected number got str instead.", str(exc.errors[0]))
 
+    def test_errors_after_valid_items_are_all_collected(self):
+        with self.assertRaises(ValidationError) as c:
+            List(Number).validate([1, 2, "a", 3, None])
+        errors = c.exception.errors
+        self.assertEqual([2, 4], [e.extras["index"] for e in errors])
+        self.assertEqual("Cannot be null.", str(errors[1]))
+
+        v = Dict(Number, key_validator=Regex("^[a-z]+$"))
+        with self.assertRaises(ValidationError) as c:
+            v.validate({"a": 1, "b": 2, "C": 3, "d": "x", "e": 5})
+        errors = c.exception.errors
+        self.assertEqual(["C", "d"], sorted(errors))
+        self.assertEqual("invalid_dict_key", errors["C"].reason_code)
+        self.assertEqual("invalid_dict_value", errors["d"].reason_code)
+
+    def test_fail_fast_and_max_errors(self):
+        v = List(Dict(Number))
+        items = [{"a": 1}, {"a": "x", "b": "y"}, {"a": None}, {"a": []}]
+
+        with self.assertRaises(ValidationError) as c:
+            v.validate(items)
+        self.assertEqual(3, len(c.exception.errors))
+
+        with self.assertRaises(ValidationError) as c:
+            v.validate(items, fail_fast=True)
+        errors = c.exception.errors
+        self.assertEqual(1, len(errors))
+        self.assertEqual(1, errors[0].extras["index"])
+        self.assertEqual(1, len(errors[0].errors))
+
+        with self.assertRaises(ValidationError) as c:
+            v.validate(items, max_errors=3)
+        errors = c.exception.errors
+        self.assertEqual(2, len(errors))
+        self.assertEqual(2, len(errors[0].errors))
+
+        # The limit only applies to the call it was passed to.
+        with self.assertRaises(ValidationError) as c:
+            v.validate(items)
+        self.assertEqual(3, len(c.exception.errors))
+
+        with self.assertRaises(ValueError):
+            v.validate(items, max_errors=0)
+
+    def test_list_of_primitives(self):
+        class MyInt(int):
+            pass
+
+        cases = [
+            (List(Integer), [1, True, MyInt(3)], None),
+            (List(Integer), [1, 2.0, 3], 1),
+            (List(Integer(nullable=True)), [1, None], None),
+            (List(Integer), [1, None], 1),
+            (List(Number), [1, 2.5], None),
+            (List(Boolean), [True, 0], 1),
+            (List(String(min_len=2, max_len=3)), ["ab", "abc"], None),
+            (List(String(min_len=2)), ["ab", "a"], 1),
+            (List(String(max_len=2, nullable=True)), ["ab", None], None),
+            (List(OneOf(1, "a")), [1, "a", 1.0], None),
+            (List(OneOf(1, "a")), [1, "b"], 1),
+            (List(OneOf(1, None)), [1, None], 1),
+            (List(OneOf([1], [2])), [[1], [2]], None),
+            (List(Float), [], None),
+        ]
+        for v, items, bad_index in cases:
+            if bad_index is None:
+                validated = v.validate(items)
+                self.assertEqual(validated, items)
+                self.assertIsNot(validated, items)
+                continue
+            with self.assertRaises(ValidationError) as c:
+                v.validate(items)
+            self.assertEqual([bad_index],
+                             [e.extras["index"] for e in c.exception.errors])
+
     def test_ensuretype_validator(self):
         v = EnsureType((int, float))
         self.assertEqual(42.0, v.validate(42.0))
@@ -136,6 +259,31 @@ class TestEachValidator(unittest.TestCase):
         self.assertEqual("Expected one of (int, float) got str instead.", str(exc))
         self.assertEqual("invalid_type", exc.reason_code)
 
+    def test_ensuretype_resolves_string_types_once(self):
+        from jsonweb.decode import from_object, _default_object_handlers
+        _default_object_handlers.clear()
+
+        @from_object()
+        class Job(object):
+            def __init__(self, title):
+                self.title = title
+
+        v = List(EnsureType("Job"))
+        resolved = v.validator.__get__(None, List)
+        self.assertIs(v.validator.__get__(None, List), resolved)
+        self.assertEqual(len(v.validate([Job("a"), Job("b")])), 2)
+
+        # Registering a new Job class invalidates the cached one.
+        @from_object(type_name="Job")
+        class OtherJob(object):
+            def __init__(self, title):
+                self.title = title
+
+        self.assertIsNot(v.validator.__get__(None, List), resolved)
+        with self.assertRaises(ValidationError):
+            v.validate([Job("a")])
+        self.assertEqual(len(v.validate([OtherJob("a")])), 1)
+
     def test_datetime_validator(self):
         v = DateTime()
         self.assertIsInstance(v.validate("2012-01-01 12:30:00"), datetime)
@@ -148,6 +296,49 @@ class TestEachValidator(unittest.TestCase):
                          "match format '%Y-%m-%d %H:%M:%S'", str(exc))
         self.assertEqual("invalid_datetime", exc.reason_code)
 
+    def test_datetime_fast_parsers_match_strptime(self):
+        from jsonweb.encode import JsonWebEncoder
+        from jsonweb import dumper
+
+        formats = ["%Y-%m-%d %H:%M:%S", JsonWebEncoder._DT_FORMAT,
+                   JsonWebEncoder._D_FORMAT, "%m/%d/%Y", "%Y%m%d%H%M%S",
+                   "%H:%M", "%Y%%"]
+        values = ["2012-01-01 12:30:00", "2012-1-1 1:2:3",
+                  "2012-01-01T12:30:00", "2012-01-01T12:30:00+01:00",
+                  "2012-01-01T24:00:00", "2012-02-30", "2012-01-01",
+                  "2012-W01-1", "01/02/2010", "1/2/2010", "20120101123000",
+                  "12:30", "2012%", "0000-01-01"]
+
+        def outcome(func, value):
+            try:
+                return func(value)
+            except (ValueError, ValidationError) as e:
+                return str(e)
+
+        for fmt in formats:
+            v = DateTime(fmt)
+            for value in values:
+                self.assertEqual(
+                    outcome(v.validate, value),
+                    outcome(lambda s: datetime.strptime(s, fmt), value)
+                )
+
+        dt = datetime(2012, 1, 2, 3, 4, 5)
+        v = DateTime(JsonWebEncoder._DT_FORMAT)
+        self.assertEqual(v.validate(dumper(dt)[1:-1]), dt)
+
+        # Only ASCII digits take the fast path, strptime decides the rest.
+        for fmt in formats:
+            v = DateTime(fmt)
+            for value in [u"\u0660" + u"3/04/2021", u"01/02/\u0662010",
+                          u"2012-01-0\uff11", u"\u0661\u0662:30"]:
+                self.assertEqual(
+                    outcome(v.validate, value),
+                    outcome(lambda s: datetime.strptime(s, fmt), value)
+                )
+        with self.assertRaises(ValidationError):
+            DateTime("%m/%d/%Y").validate(u"\u0660" + u"3/04/2021")
+
     def test_nullable_is_true(self):
         v = Integer(nullable=True)
         self.assertEqual(None, v.validate(None))
@@ -209,4 +400,42 @@ class TestValidationError(unittest.TestCase):
             "errors": {"key": "value"}
         }
 
-        self.assertDictEqual(e.to_json(), expected_dict)
\ No newline at end of file
+        self.assertDictEqual(e.to_json(), expected_dict)
+
+    def test_message_is_formatted_when_first_used(self):
+        import pickle
+        calls = []
+
+        class Loud(object):
+            def __str__(self):
+                calls.append(1)
+                return "loud"
+
+        with self.assertRaises(ValidationError) as c:
+            OneOf("a", "b").validate(Loud())
+        self.assertEqual(calls, [])
+
+        exc = c.exception
+        self.assertEqual("Expected one of ('a', 'b') but got loud instead.",
+                         str(exc))
+        self.assertEqual(exc.to_json()["reason"], str(exc))
+        self.assertEqual(calls, [1])
+
+        with self.assertRaises(ValidationError) as c:
+            Integer().validate("1")
+        exc = pickle.loads(pickle.dumps(c.exception))
+        self.assertEqual("Expected int got str instead.", str(exc))
+
+    def test_args_hold_the_formatted_message(self):
+        import json
+        for validate in (Integer().validate, List(Integer).validate,
+                         String(max_len=1).validate):
+            with self.assertRaises(ValidationError) as c:
+                validate("xx")
+            exc = c.exception
+            self.assertEqual(exc.args, (str(exc),))
+            self.assertTrue(isinstance(exc.args[0], str))
+            self.assertEqual(json.loads(json.dumps(exc.args)), [str(exc)])
+        self.assertEqual(exc.args[0], "String exceeds max length of 1.")
+        if hasattr(exc, "message"):
+            self.assertEqual(exc.message, "String exceeds max length of 1.")
@@ -1,11 +1,46 @@
 
 import inspect
 import re
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
 from jsonweb import encode
 
-from jsonweb.py3k import basestring, items
+from jsonweb.py3k import PY3k, basestring, items, keys
 from jsonweb.exceptions import JsonWebError
+from jsonweb._local import context_stack
+
+_error_limit_context = context_stack("jsonweb_error_limit")
+
+
+class _ErrorLimit(object):
+    """
+    Counts the errors collected while a validation started with
+    ``fail_fast`` or ``max_errors`` is running.
+    """
+    def __init__(self, max_errors):
+        self.max_errors = max_errors
+        self.count = 0
+
+
+@contextmanager
+def _limit_errors(fail_fast=False, max_errors=None):
+    """
+    Make validators in the active context stop collecting errors after the
+    first one (``fail_fast``) or after ``max_errors``.
+    """
+    if fail_fast:
+        max_errors = 1
+    if max_errors is None:
+        yield
+        return
+    if max_errors < 1:
+        raise ValueError("max_errors must be at least 1.")
+    _error_limit_context.push(_ErrorLimit(max_errors))
+    try:
+        yield
+    finally:
+        _error_limit_context.pop()
 
 
 class _Errors(object):
@@ -13,7 +48,8 @@ class _Errors(object):
         self.errors = list_or_dict
 
     def add_error(self, exc, key=None, reason_code=None, **extras):
-        exc = isinstance(exc, ValidationError) and exc or ValidationError(exc)
+        if not isinstance(exc, ValidationError):
+            exc = ValidationError(exc)
         if reason_code is not None:
             exc.reason_code = reason_code
         exc.extras.update(extras)
@@ -23,15 +59,134 @@ class _Errors(object):
         else:
             self.errors.append(exc)
 
+        # Only count leaf errors, nested ones were counted when collected.
+        limit = _error_limit_context.top
+        if limit is not None and not exc.errors:
+            limit.count += 1
+
+    @property
+    def full(self):
+        """
+        True once the active ``max_errors`` limit (if any) has been reached
+        and the collecting validator should stop and raise.
+        """
+        limit = _error_limit_context.top
+        return limit is not None and limit.count >= limit.max_errors
+
     def raise_if_errors(self, reason, **kw):
         if self.errors:
             raise ValidationError(reason, errors=self.errors, **kw)
 
+    def failure(self, reason, **kw):
+        """
+        The error :meth:`raise_if_errors` would raise, for ``_collect``.
+        """
+        return ValidationError(reason, errors=self.errors, **kw)
+
+
+#: Returned by ``_collect`` in place of a value that failed validation.
+#: Validators report errors through ``_collect(item, sink)``: they append a
+#: :class:`ValidationError` to the list ``sink``, without raising it, and
+#: return ``_INVALID``. Only the outermost validator raises.
+_INVALID = object()
+
+
+def _validate_collecting(validator, item):
+    # ``_validate`` for validators that implement ``_collect``.
+    sink = []
+    value = validator._collect(item, sink)
+    if value is _INVALID:
+        raise sink[0]
+    return value
+
+
+def _collect_by_raising(validator, item, sink):
+    try:
+        return validator.validate(item)
+    except ValidationError as e:
+        sink.append(e)
+        return _INVALID
+
+
+_native_collectors = {}
+
+
+def _collector(validator):
+    """
+    Return a ``collect(item, sink)`` function for ``validator``. That is its
+    own ``_collect`` method, unless its class overrides ``validate`` or
+    ``_validate`` further down than ``_collect`` is defined, in which case
+    errors are caught from :meth:`BaseValidator.validate` instead.
+    """
+    cls = type(validator)
+    native = _native_collectors.get(cls)
+    if native is None:
+        native = _native_collectors[cls] = _has_native_collect(cls)
+    if native:
+        return validator._collect
+    return lambda item, sink: _collect_by_raising(validator, item, sink)
+
+
+def _has_native_collect(cls):
+    for klass in inspect.getmro(cls):
+        if klass is not BaseValidator and "_collect" in vars(klass):
+            return True
+        if "_validate" in vars(klass) or "validate" in vars(klass):
+            return False
+    return False
+
+
+def _type_failure(obj, cls):
+    # The error isinstance_or_raise would raise, for _collect.
+    return ValidationError(_Message("Expected {0} got {1} instead.", (
+        _Deferred(cls_name, cls),
+        _Deferred(cls_name, obj)
+    )), "invalid_type")
+
+
+class _Message(object):
+    """
+    An error message that is only formatted, with :meth:`str.format`, the
+    first time it is turned into a string. Validators that reject a lot of
+    input mostly have their errors caught and counted, never displayed.
+    """
+    def __init__(self, template, args):
+        self.template = template
+        self.args = args
+        self.text = None
+
+    def __str__(self):
+        if self.text is None:
+            self.text = self.template.format(*self.args)
+            self.args = None
+        return self.text
+
+    def __repr__(self):
+        return repr(str(self))
+
+
+class _Deferred(object):
+    """
+    A :class:`_Message` argument rendered as ``func(obj)`` when (and if)
+    the message is formatted.
+    """
+    def __init__(self, func, obj):
+        self.func = func
+        self.obj = obj
+
+    def __format__(self, spec):
+        return format(self.func(self.obj), spec)
+
 
 @encode.to_object()
 class ValidationError(JsonWebError):
     """
     Raised from ``JsonWeb`` validators when validation of an object fails.
+
+    The message of errors raised by the built in validators is formatted
+    the first time the error is turned into a string (or JSON) or its
+    ``args`` are read, so the values it mentions are those they had at that
+    point.
     """
     def __init__(self, reason, reason_code=None, errors=None, **extras):
         """
@@ -44,6 +199,30 @@ class ValidationError(JsonWebError):
         self.errors = errors
         self.reason_code = reason_code
 
+    @property
+    def args(self):
+        # Render a lazy message the first time anyone looks, so ``args``
+        # only ever shows plain strings.
+        args = BaseException.args.__get__(self)
+        if args and isinstance(args[0], _Message):
+            args = (str(args[0]),) + args[1:]
+            BaseException.args.__set__(self, args)
+        return args
+
+    @args.setter
+    def args(self, args):
+        BaseException.args.__set__(self, args)
+
+    if not PY3k:
+        @property
+        def message(self):
+            args = self.args
+            return len(args) == 1 and args[0] or ""
+
+        @message.setter
+        def message(self, message):
+            BaseException.message.__set__(self, message)
+
     @encode.handler
     def to_json(self):
         obj = {"reason": str(self)}
@@ -92,7 +271,23 @@ class BaseValidator(object):
         self.default = default
         self.reason_code = reason_code
 
-    def validate(self, item):
+    def validate(self, item, fail_fast=False, max_errors=None):
+        """
+        Validate ``item`` and return the validated object, or raise a
+        :class:`ValidationError`.
+
+        By default every error found is collected in the raised exception.
+        Pass ``fail_fast=True`` to raise as soon as the first one is found,
+        without looking at the rest of ``item``, or ``max_errors`` to stop
+        after that many. The exception has the same shape either way, it
+        just holds fewer errors.
+
+        :param fail_fast: Stop at the first error.
+        :param max_errors: Stop after this many errors.
+        """
+        if fail_fast or max_errors is not None:
+            with _limit_errors(fail_fast, max_errors):
+                return self.validate(item)
         if item is None:
             if self.nullable:
                 return item
@@ -111,9 +306,31 @@ class BaseValidator(object):
     def _validate(self, item):
         raise NotImplemented
 
+    def _collect(self, item, sink):
+        """
+        Validate ``item`` without raising. Return the validated value, or
+        append a (not raised) :class:`ValidationError` to the list ``sink``
+        and return :data:`_INVALID`. The default implementation calls :meth:`validate`
+        and records any :class:`ValidationError` it raises.
+        """
+        return _collect_by_raising(self, item, sink)
+
+    def _collect_null(self, sink):
+        # What validate does with None, for _collect implementations.
+        if self.nullable:
+            return None
+        sink.append(self._failure("Cannot be null."))
+        return _INVALID
+
+    def _failure(self, message, *args):
+        # The error raise_error would raise, for _collect.
+        if len(args):
+            message = _Message(message, args)
+        return ValidationError(message, self.reason_code)
+
     def raise_error(self, message, *args):
         if len(args):
-            message = message.format(*args)
+            message = _Message(message, args)
 
         exc = ValidationError(message)
 
@@ -122,6 +339,10 @@ class BaseValidator(object):
         raise exc
 
 
+#: Default number of valid keys a :class:`Dict` remembers.
+KEY_CACHE_SIZE = 1024
+
+
 class Dict(BaseValidator):
     """
     .. versionadded:: 0.8
@@ -158,47 +379,108 @@ class Dict(BaseValidator):
         # String does not match pattern '^[a-z]{2}_[A-Z]{2}$'.
         # invalid_dict_key
 
+    Keys that pass ``key_validator`` are remembered (up to
+    ``key_cache_size`` of them, the oldest dropped first) and not validated
+    again by the same ``Dict``. Plain :class:`String` key validators check
+    all the keys of a dict at once instead.
+
     """
 
-    def __init__(self, validator, key_validator=None, **kw):
+    def __init__(self, validator, key_validator=None,
+                 key_cache_size=KEY_CACHE_SIZE, **kw):
         """
         :param validator: A :class:`BaseValidator` subclass which all values
                           of a dict will be validated against.
         :param key_validator: A :class:`String` subclass which all keys
                               of a dict will be validated against.
                               (Default: :class:`String`)
+        :param key_cache_size: Number of keys found valid by
+                               ``key_validator`` to remember, so they are
+                               not validated again. ``0`` disables this.
+                               (Default: :data:`KEY_CACHE_SIZE`)
         """
         super(Dict, self).__init__(reason_code="invalid_dict", **kw)
         self.validator = to_instance(validator)
         self.key_validator = to_instance(key_validator) or String()
         assert isinstance(self.key_validator, String)
+        self.key_cache_size = key_cache_size
+        self.__valid_keys = OrderedDict()
 
     def _validate(self, obj):
-        isinstance_or_raise(obj, dict)
-        errors = _Errors({})
+        return _validate_collecting(self, obj)
+
+    def _collect(self, obj, sink):
+        if obj is None:
+            return self._collect_null(sink)
+        if not isinstance(obj, dict):
+            sink.append(_type_failure(obj, dict))
+            return _INVALID
         validated_obj = {}
+        collect = _collector(get_validator(self.validator))
+        collect_key = self.__key_collector(obj)
+        errors = None
 
+        # Errors from keys and values are popped straight back off ``sink``
+        # into a collector that is only allocated once something fails.
         for k, v in items(obj):
-            if not self._key_is_valid(k, errors):
-                continue
-            try:
-                validated_obj[k] = get_validator(self.validator).validate(v)
-            except ValidationError as e:
-                errors.add_error(e, key=k, reason_code="invalid_dict_value")
-
-        errors.raise_if_errors("Error validating dict.",
-                               reason_code=self.reason_code)
+            if collect_key and collect_key(k, sink) is _INVALID:
+                reason_code = "invalid_dict_key"
+            else:
+                value = collect(v, sink)
+                if value is not _INVALID:
+                    validated_obj[k] = value
+                    continue
+                reason_code = "invalid_dict_value"
+            if errors is None:
+                errors = _Errors({})
+            errors.add_error(sink.pop(), key=k, reason_code=reason_code)
+            if errors.full:
+                break
+
+        if errors is not None:
+            sink.append(errors.failure("Error validating dict.",
+                                       reason_code=self.reason_code))
+            return _INVALID
         return validated_obj
 
-    def _key_is_valid(self, key, errors):
-        if self.key_validator is None:
-            return True
-        try:
-            self.key_validator.validate(key)
-        except ValidationError as e:
-            errors.add_error(e, key=key, reason_code="invalid_dict_key")
-            return False
-        return True
+    def __key_collector(self, obj):
+        """
+        Return a ``collect(key, sink)`` function for the keys of ``obj``, or
+        None if they are all known to be valid.
+        """
+        key_validator = self.key_validator
+        if not key_validator:
+            return None
+        # Keys of decoded JSON are always strings, so the default String
+        # passes them with one check per distinct type.
+        if type(key_validator) in _BULK_VALIDATORS:
+            if key_validator._all_valid(obj):
+                return None
+            return _collector(key_validator)
+        if not self.key_cache_size:
+            return _collector(key_validator)
+
+        valid_keys = self.__valid_keys
+        if keys(obj) <= keys(valid_keys):
+            return None
+        collect_key = _collector(key_validator)
+        size = self.key_cache_size
+
+        def collect_cached(key, sink):
+            if key in valid_keys:
+                return key
+            value = collect_key(key, sink)
+            if value is not _INVALID:
+                valid_keys[key] = True
+                # Drop the oldest key once full. Another thread may have
+                # got there first.
+                if len(valid_keys) > size:
+                    try:
+                        valid_keys.popitem(last=False)
+                    except KeyError:
+                        pass
+            return value
+        return collect_cached
 
 
 class List(BaseValidator):
@@ -232,20 +514,43 @@ class List(BaseValidator):
         self.validator = to_instance(validator)
 
     def _validate(self, item):
-        isinstance_or_raise(item, list)
+        return _validate_collecting(self, item)
+
+    def _collect(self, item, sink):
+        if item is None:
+            return self._collect_null(sink)
+        if not isinstance(item, list):
+            sink.append(_type_failure(item, list))
+            return _INVALID
+        validator = get_validator(self.validator)
+        # Primitive validators return items unchanged, so if they can vouch
+        # for the whole list in one pass there is nothing left to do.
+        if type(validator) in _BULK_VALIDATORS and validator._all_valid(item):
+            return list(item)
+
         validated_objs = []
-        errors = _Errors([])
+        append = validated_objs.append
+        collect = _collector(validator)
+        errors = None
 
+        # Item errors are popped straight back off ``sink`` into a collector
+        # that is only allocated once something fails.
         for i, obj in enumerate(item):
-            try:
-                validated_objs.append(
-                    get_validator(self.validator).validate(obj)
-                )
-            except ValidationError as e:
-                errors.add_error(e, reason_code="invalid_list_item", index=i)
-
-        errors.raise_if_errors("Error validating list.",
-                               reason_code=self.reason_code)
+            value = collect(obj, sink)
+            if value is not _INVALID:
+                append(value)
+                continue
+            if errors is None:
+                errors = _Errors([])
+            errors.add_error(sink.pop(), reason_code="invalid_list_item",
+                             index=i)
+            if errors.full:
+                break
+
+        if errors is not None:
+            sink.append(errors.failure("Error validating list.",
+                                       reason_code=self.reason_code))
+            return _INVALID
         return validated_objs
 
     def to_json(self):
@@ -278,13 +583,36 @@ class EnsureType(BaseValidator):
         if isinstance(_type, str):
             type_name = _type
         self.__type_name = type_name or self.__type_name(_type)
+        # (registry generation, resolved EnsureType) for string types.
+        self.__resolved = None
 
     def _validate(self, item):
         if not isinstance(item, self.__type):
             self.raise_error("Expected {0} got {1} instead.",
-                             self.__type_name, cls_name(item))
+                             self.__type_name, _Deferred(cls_name, item))
         return item
 
+    def _collect(self, item, sink):
+        if item is None:
+            return self._collect_null(sink)
+        if isinstance(item, self.__type):
+            return item
+        sink.append(self._failure("Expected {0} got {1} instead.",
+                                  self.__type_name, _Deferred(cls_name, item)))
+        return _INVALID
+
+    def _all_valid(self, items):
+        """
+        Return True if every item in the list ``items`` is of this type (or
+        None when nullable), checking each distinct type only once.
+        """
+        types = set(map(type, items))
+        if type(None) in types:
+            if not self.nullable:
+                return False
+            types.discard(type(None))
+        return all(issubclass(t, self.__type) for t in types)
+
     def __type_name(self, _type):
         if isinstance(_type, tuple):
             return "one of ({0})".format(", ".join((t.__name__ for t in _type)))
@@ -297,19 +625,27 @@ class EnsureType(BaseValidator):
         if not isinstance(self.__type, str):
             return self
 
-        from jsonweb.decode import _default_object_handlers
-        #``_type`` was a string and now we must get the actual class
-        handler = _default_object_handlers.get(self.__type)
+        #``_type`` was a string and now we must get the actual class. The
+        #result is reused until the handler registry changes.
+        handlers = _object_handlers()
+        generation = handlers.generation
+        resolved = self.__resolved
+        if resolved is not None and resolved[0] == generation:
+            return resolved[1]
+
+        handler = handlers.get(self.__type)
 
         if not handler:
             raise JsonWebError("Cannot find class {0}.".format(self.__type))
 
-        return EnsureType(
+        validator = EnsureType(
             handler[1],
             type_name=self.__type_name,
             optional=(not self.required),
             nullable=self.nullable
         )
+        self.__resolved = (generation, validator)
+        return validator
 
     def to_json(self, **kw):
         return super(EnsureType, self).to_json(
@@ -349,6 +685,17 @@ class String(EnsureType):
         self.max_len = max_len
         self.min_len = min_len
 
+    def _all_valid(self, items):
+        if not super(String, self)._all_valid(items):
+            return False
+        if not (self.min_len or self.max_len) or not items:
+            return True
+        if None in items:
+            return False
+        lengths = set(map(len, items))
+        return (not self.min_len or min(lengths) >= self.min_len) and \
+            (not self.max_len or max(lengths) <= self.max_len)
+
     def _validate(self, item):
         value = super(String, self)._validate(item)
         if self.min_len and len(value) < self.min_len:
@@ -357,6 +704,20 @@ class String(EnsureType):
             self.raise_error("String exceeds max length of {0}.", self.max_len)
         return value
 
+    def _collect(self, item, sink):
+        value = super(String, self)._collect(item, sink)
+        if value is _INVALID or value is None:
+            return value
+        if self.min_len and len(value) < self.min_len:
+            sink.append(self._failure("String must be at least length {0}.",
+                                      self.min_len))
+            return _INVALID
+        if self.max_len and len(value) > self.max_len:
+            sink.append(self._failure("String exceeds max length of {0}.",
+                                      self.max_len))
+            return _INVALID
+        return value
+
 
 class Regex(String):
     """
@@ -436,6 +797,13 @@ class DateTime(BaseValidator):
         >>> DateTime("%m/%d/%Y").validate("01/02/2010")
         ... datetime.datetime(2010, 1, 2, 0, 0)
 
+    Formats made up of only ``%Y``, ``%m``, ``%d``, ``%H``, ``%M``, ``%S``
+    and literal characters (such as the default, or
+    :class:`~jsonweb.encode.JsonWebEncoder`'s ``%Y-%m-%dT%H:%M:%S``) are
+    parsed without :meth:`datetime.strptime` when the value is zero padded
+    to the full width. Anything else, including every invalid value, still
+    goes through :meth:`~datetime.datetime.strptime` so results and error
+    messages are unchanged.
 
     """
     def __init__(self, format="%Y-%m-%d %H:%M:%S", **kw):
@@ -443,6 +811,11 @@ class DateTime(BaseValidator):
         self.format = format
 
     def _validate(self, item):
+        parse = _datetime_parser(self.format)
+        if parse is not None:
+            value = parse(item)
+            if value is not None:
+                return value
         try:
             return datetime.strptime(item, self.format)
         except ValueError as e:
@@ -455,6 +828,95 @@ class DateTime(BaseValidator):
         )
 
 
+_fromisoformat = getattr(datetime, "fromisoformat", None)
+
+#: ISO 8601 compatible formats mapped to their date/time separator.
+_ISO_FORMATS = {
+    "%Y-%m-%dT%H:%M:%S": "T",
+    "%Y-%m-%d %H:%M:%S": " ",
+    "%Y-%m-%d": None,
+}
+
+# Fixed width strptime directives mapped to their datetime() argument
+# position and width.
+_FIXED_WIDTH = {
+    "Y": (0, 4), "m": (1, 2), "d": (2, 2), "H": (3, 2), "M": (4, 2),
+    "S": (5, 2),
+}
+
+_datetime_parsers = {}
+
+
+def _datetime_parser(format):
+    """
+    Return a function parsing strings of ``format`` (see :class:`DateTime`)
+    into datetimes, or None if ``format`` has no fast parser. The function
+    returns None for any value it does not handle, leaving it to strptime.
+    Parsers are built once per format.
+    """
+    try:
+        return _datetime_parsers[format]
+    except KeyError:
+        pass
+    if format in _ISO_FORMATS and _fromisoformat is not None:
+        parser = _iso_parser(_ISO_FORMATS[format])
+    else:
+        parser = _fixed_width_parser(format)
+    _datetime_parsers[format] = parser
+    return parser
+
+
+def _iso_parser(sep):
+    # Checking the separators first keeps out the other ISO 8601 forms
+    # fromisoformat understands but strptime would reject.
+    size = sep and 19 or 10
+
+    def parse(value):
+        try:
+            if len(value) != size or value[4] != "-" or value[7] != "-" or \
+                    sep and (value[10] != sep or value[13] != ":" or
+                             value[16] != ":"):
+                return None
+            return _fromisoformat(value)
+        except (TypeError, ValueError):
+            return None
+    return parse
+
+
+def _fixed_width_parser(format):
+    pattern = []
+    positions = []
+    for i, part in enumerate(re.split(r"%(.)", format)):
+        if i % 2 == 0:
+            # strptime lets whitespace match any amount of it, and a stray
+            # "%" is an error.
+            if "%" in part or any(c.isspace() for c in part):
+                return None
+            pattern.append(re.escape(part))
+        elif part in _FIXED_WIDTH and _FIXED_WIDTH[part][0] not in positions:
+            position, width = _FIXED_WIDTH[part]
+            positions.append(position)
+            pattern.append(r"([0-9]{%d})" % width)
+        else:
+            return None
+    if not positions:
+        return None
+    match = re.compile("".join(pattern) + r"\Z").match
+
+    def parse(value):
+        try:
+            m = match(value)
+            if m is None:
+                return None
+            args = [1900, 1, 1, 0, 0, 0]
+            for position, digits in zip(positions, m.groups()):
+                args[position] = int(digits)
+            return datetime(*args)
+        except (TypeError, ValueError):
+            return None
+    return parse
+
+
 class OneOf(BaseValidator):
     """
     .. versionadded:: 0.6.4
@@ -471,16 +933,27 @@ class OneOf(BaseValidator):
 
     def _validate(self, item):
 
-        def stringify(item):
-            if isinstance(item, str):
-                return "'{0}'".format(item)
-            return str(item)
-
         if item in self.allowed_values:
             return item
 
         self.raise_error("Expected one of {0} but got {1} instead.",
-                         self.allowed_values, stringify(item))
+                         self.allowed_values, _Deferred(_stringify, item))
+
+    def _all_valid(self, items):
+        """
+        Return True if every item in the list ``items`` is an allowed value
+        (or None when nullable). Unhashable values are left to
+        :meth:`validate`.
+        """
+        try:
+            values = set(items)
+            if None in values:
+                if not self.nullable:
+                    return False
+                values.discard(None)
+            return values.issubset(self.allowed_values)
+        except TypeError:
+            return False
 
 
 class SubSetOf(BaseValidator):
@@ -505,6 +978,13 @@ class SubSetOf(BaseValidator):
         self.raise_error("{0} is not a subset of {1}", sub_set, self.super_set)
 
 
+# Validators (but not their subclasses) that List asks to vouch for a whole
+# list at once with ``_all_valid``.
+_BULK_VALIDATORS = frozenset(
+    (EnsureType, String, Integer, Float, Boolean, Number, OneOf)
+)
+
+
 def to_instance(obj):
     return inspect.isclass(obj) and obj() or obj
 
@@ -518,12 +998,29 @@ def get_validator(validator):
     return validator
 
 
+_handlers = []
+
+
+def _object_handlers():
+    # jsonweb.decode imports this module so the registry is fetched lazily.
+    if not _handlers:
+        from jsonweb.decode import _default_object_handlers
+        _handlers.append(_default_object_handlers)
+    return _handlers[0]
+
+
 def isinstance_or_raise(obj, cls):
     if not isinstance(obj, cls):
-        raise ValidationError("Expected {0} got {1} instead.".format(
-            cls_name(cls),
-            cls_name(obj)
-        ), reason_code="invalid_type")
+        raise ValidationError(_Message("Expected {0} got {1} instead.", (
+            _Deferred(cls_name, cls),
+            _Deferred(cls_name, obj)
+        )), reason_code="invalid_type")
+
+
+def _stringify(item):
+    if isinstance(item, str):
+        return "'{0}'".format(item)
+    return str(item)
 
 
 def cls_name(obj):